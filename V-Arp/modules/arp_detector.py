@@ -7,15 +7,34 @@ Bu modül, ağda ARP spoofing tespit etmek için gerekli tüm fonksiyonları iç
 """
 
 import sys
+import errno
+import ctypes
+import itertools
 import subprocess
 import socket
 import struct
 import time
 import re
 import os
+import mmap
+import select
 import threading
+import json
+import heapq
+import random
 import logging
-from collections import defaultdict
+from array import array
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from modules.oui import lookup_vendor
+
+# Büyük tablolarda vektörel tespit için NumPy (isteğe bağlı)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 # Loglama
 logger = logging.getLogger("V-ARP.arp_detector")
@@ -27,232 +46,2813 @@ def format_mac(mac_bytes):
         return ':'.join(f'{b:02x}' for b in mac_bytes)
     return mac_bytes
 
-# IP adreslerini düzgün formatta gösterme
-def format_ip(ip_bytes):
-    """Binary IP adresini okunabilir formata çevirir."""
-    if isinstance(ip_bytes, bytes):
-        return socket.inet_ntoa(ip_bytes)
-    return ip_bytes
+# IP adreslerini düzgün formatta gösterme
+def format_ip(ip_bytes):
+    """Binary IP adresini okunabilir formata çevirir."""
+    if isinstance(ip_bytes, bytes):
+        return socket.inet_ntoa(ip_bytes)
+    return ip_bytes
+
+# /proc/net/arp dosyasının yolu (Linux)
+PROC_NET_ARP = "/proc/net/arp"
+
+# ARP bayrakları (linux/if_arp.h)
+ATF_COM = 0x02  # Tamamlanmış kayıt (MAC adresi çözülmüş)
+
+# /proc/net/arp içeriğini ayrıştırma
+def parse_proc_net_arp(content):
+    """
+    /proc/net/arp içeriğini toplu olarak ayrıştırır.
+    
+    Args:
+        content (str): /proc/net/arp dosyasının tamamı
+        
+    Returns:
+        list: ARP tablosundaki kayıtlar listesi
+    """
+    arp_entries = []
+    # Başlık satırını atla; sütunlar: IP, HW type, Flags, HW address, Mask, Device
+    for line in content.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) < 6:
+            continue
+        # Eksik kayıtları atla (ATF_COM bayrağı yoksa MAC çözülmemiştir)
+        if not int(parts[2], 16) & ATF_COM:
+            continue
+        arp_entries.append({"ip": parts[0], "mac": parts[3], "interface": parts[5]})
+    return arp_entries
+
+# ARP tablosunu /proc/net/arp üzerinden alma
+def get_arp_table_proc(path=PROC_NET_ARP):
+    """
+    ARP tablosunu alt süreç başlatmadan doğrudan /proc/net/arp dosyasından okur.
+    
+    Args:
+        path (str): Okunacak dosyanın yolu
+        
+    Returns:
+        list: ARP tablosundaki kayıtlar listesi
+    """
+    with open(path, 'r', encoding='ascii', errors='replace') as f:
+        content = f.read()
+    return parse_proc_net_arp(content)
+
+# rtnetlink sabitleri (linux/netlink.h, linux/rtnetlink.h, linux/neighbour.h)
+NETLINK_ROUTE = 0
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x01
+NLM_F_DUMP = 0x300
+RTM_NEWNEIGH = 28
+RTM_DELNEIGH = 29
+RTM_GETNEIGH = 30
+NDA_DST = 1
+NDA_LLADDR = 2
+RTNLGRP_NEIGH = 3
+
+# Komşu (NUD) durumları
+NUD_STATES = {
+    0x01: "INCOMPLETE",
+    0x02: "REACHABLE",
+    0x04: "STALE",
+    0x08: "DELAY",
+    0x10: "PROBE",
+    0x20: "FAILED",
+    0x40: "NOARP",
+    0x80: "PERMANENT",
+}
+
+# Netlink yapıları: nlmsghdr, ndmsg ve rtattr
+_NLMSGHDR = struct.Struct("=IHHII")
+_NDMSG = struct.Struct("=BxxxiHBB")
+_RTATTR = struct.Struct("=HH")
+
+def _nl_align(length):
+    """Netlink uzunluğunu 4 byte sınırına hizalar."""
+    return (length + 3) & ~3
+
+def _interface_name(ifindex, cache):
+    """Arayüz indeksini arayüz adına çevirir (sonuçları önbellekte tutar)."""
+    name = cache.get(ifindex)
+    if name is None:
+        try:
+            name = socket.if_indextoname(ifindex)
+        except OSError:
+            name = str(ifindex)
+        cache[ifindex] = name
+    return name
+
+# Tek bir komşu mesajını ayrıştırma
+def parse_neigh_message(view, offset, length, ifname_cache=None):
+    """
+    Tek bir RTM_NEWNEIGH/RTM_DELNEIGH mesajının gövdesini ayrıştırır.
+    
+    Args:
+        view (memoryview): Netlink tamponu
+        offset (int): ndmsg yapısının başlangıcı
+        length (int): Mesaj gövdesinin uzunluğu (nlmsghdr hariç)
+        ifname_cache (dict): Arayüz indeksi -> ad önbelleği
+        
+    Returns:
+        dict: {"ip", "mac", "interface", "state"} kaydı; IPv4 dışı kayıtlarda None
+    """
+    if ifname_cache is None:
+        ifname_cache = {}
+    family, ifindex, state, _flags, _ntype = _NDMSG.unpack_from(view, offset)
+    if family != socket.AF_INET:
+        return None
+    
+    ip = None
+    mac = None
+    end = offset + length
+    pos = offset + _NDMSG.size
+    # Öznitelikleri tek geçişte oku
+    while pos + _RTATTR.size <= end:
+        rta_len, rta_type = _RTATTR.unpack_from(view, pos)
+        if rta_len < _RTATTR.size:
+            break
+        data = view[pos + _RTATTR.size:pos + rta_len]
+        if rta_type == NDA_DST:
+            ip = socket.inet_ntoa(data)
+        elif rta_type == NDA_LLADDR and len(data) == 6:
+            mac = format_mac(bytes(data))
+        pos += _nl_align(rta_len)
+    
+    if ip is None:
+        return None
+    return {
+        "ip": ip,
+        "mac": mac,
+        "interface": _interface_name(ifindex, ifname_cache),
+        "state": NUD_STATES.get(state, "NONE"),
+    }
+
+# Netlink tamponundaki komşu mesajlarını ayrıştırma
+def parse_neigh_dump(buffer, ifname_cache=None):
+    """
+    Bir netlink tamponundaki tüm komşu mesajlarını tek geçişte ayrıştırır.
+    
+    Args:
+        buffer (bytes): recv ile alınan netlink verisi
+        ifname_cache (dict): Arayüz indeksi -> ad önbelleği
+        
+    Returns:
+        tuple: (kayıt listesi, dump tamamlandı mı)
+    """
+    if ifname_cache is None:
+        ifname_cache = {}
+    view = memoryview(buffer)
+    entries = []
+    done = False
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(view):
+        msg_len, msg_type, _flags, _seq, _pid = _NLMSGHDR.unpack_from(view, offset)
+        if msg_len < _NLMSGHDR.size:
+            break
+        if msg_type == NLMSG_DONE:
+            done = True
+            break
+        if msg_type == NLMSG_ERROR:
+            error = struct.unpack_from("=i", view, offset + _NLMSGHDR.size)[0]
+            if error:
+                raise OSError(-error, os.strerror(-error))
+        elif msg_type in (RTM_NEWNEIGH, RTM_DELNEIGH):
+            entry = parse_neigh_message(view, offset + _NLMSGHDR.size,
+                                        msg_len - _NLMSGHDR.size, ifname_cache)
+            if entry is not None:
+                entry["deleted"] = msg_type == RTM_DELNEIGH
+                entries.append(entry)
+        offset += _nl_align(msg_len)
+    return entries, done
+
+# ARP tablosunu rtnetlink üzerinden alma
+def build_neigh_dump_request(seq):
+    """
+    IPv4 komşu tablosunu döken RTM_GETNEIGH isteğini oluşturur.
+    
+    Args:
+        seq (int): Netlink sıra numarası
+        
+    Returns:
+        bytes: Netlink soketine gönderilecek istek
+    """
+    request = _NLMSGHDR.pack(_NLMSGHDR.size + _NDMSG.size, RTM_GETNEIGH,
+                             NLM_F_REQUEST | NLM_F_DUMP, seq & 0xFFFFFFFF, 0)
+    return request + _NDMSG.pack(socket.AF_INET, 0, 0, 0, 0)
+
+def neigh_table_entries(entries, include_incomplete=False):
+    """
+    Netlink dökümündeki kayıtları ARP tablosu kayıtlarına süzer.
+    
+    Args:
+        entries (list): parse_neigh_dump() kayıtları
+        include_incomplete (bool): MAC adresi çözülmemiş kayıtları da döndür
+        
+    Returns:
+        list: {"ip", "mac", "interface", "state"} kayıtları
+    """
+    arp_entries = []
+    for entry in entries:
+        del entry["deleted"]
+        if entry["state"] == "NOARP":
+            continue  # ARP kullanmayan arayüz kayıtlarını (lo vb.) atla
+        if entry["mac"] is None and not include_incomplete:
+            continue  # Eksik kayıtları atla
+        arp_entries.append(entry)
+    return arp_entries
+
+def get_arp_table_netlink(include_incomplete=False):
+    """
+    Çekirdek komşu tablosunu NETLINK_ROUTE soketi üzerinden RTM_GETNEIGH ile döker.
+    
+    Args:
+        include_incomplete (bool): MAC adresi çözülmemiş (INCOMPLETE/FAILED) kayıtları da döndür
+        
+    Returns:
+        list: {"ip", "mac", "interface", "state"} kayıtları listesi
+    """
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    try:
+        sock.bind((0, 0))
+        sock.send(build_neigh_dump_request(int(time.time())))
+        
+        arp_entries = []
+        ifname_cache = {}
+        done = False
+        while not done:
+            entries, done = parse_neigh_dump(sock.recv(1 << 16), ifname_cache)
+            arp_entries.extend(neigh_table_entries(entries, include_incomplete))
+        return arp_entries
+    finally:
+        sock.close()
+
+# Komşu tablosu değişikliklerine abone olma
+def open_neigh_monitor_socket():
+    """
+    RTNLGRP_NEIGH çoklu yayın grubuna abone olan bir netlink soketi açar.
+    
+    Returns:
+        socket.socket: RTM_NEWNEIGH/RTM_DELNEIGH bildirimlerini alan soket
+    """
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    try:
+        sock.bind((0, 1 << (RTNLGRP_NEIGH - 1)))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+# Ayraçlı altı oktetli MAC adresi (başında sıfır olmayan oktetler dahil)
+_MAC_PATTERN = re.compile(r'^[0-9A-Fa-f]{1,2}(?:[:-][0-9A-Fa-f]{1,2}){5}$')
+
+# ARP tablosunu arp komutuyla alma
+def get_arp_table_command():
+    """
+    ARP tablosunu işletim sisteminin arp komutunu çalıştırarak alır.
+    
+    Returns:
+        list: ARP tablosundaki kayıtlar listesi
+    """
+    arp_entries = []
+    
+    # Platforma göre uygun komutu belirle
+    if os.name == 'nt':  # Windows
+        # Windows'ta arp komutunu çalıştır
+        output = subprocess.check_output(['arp', '-a'], text=True)
+        # Windows ARP çıktısını ayrıştır
+        # (MAC altı okteti zorunlu; "Interface: 192.168.1.5 --- 0xb" başlık satırları eşleşmez)
+        pattern = r'(\d+\.\d+\.\d+\.\d+)\s+((?:[0-9a-fA-F]{2}-){5}[0-9a-fA-F]{2})\s+(\w+)'
+        for line in output.split('\n'):
+            match = re.search(pattern, line)
+            if match:
+                ip, mac, interface_type = match.groups()
+                mac = mac.replace('-', ':')  # Standart formata çevir
+                arp_entries.append({"ip": ip, "mac": mac, "interface": interface_type})
+    else:  # Linux/Unix
+        # Linux'ta arp komutunu çalıştır
+        output = subprocess.check_output(['arp', '-n'], text=True)
+        # Linux ARP çıktısını ayrıştır
+        for line in output.split('\n')[1:]:  # Başlık satırını atla
+            if line.strip():
+                parts = line.split()
+                if len(parts) >= 3:
+                    ip = parts[0]
+                    mac = parts[2]
+                    interface = parts[-1] if len(parts) > 3 else "unknown"
+                    # Eksik kayıtları ("(incomplete)" ya da MAC yerine arayüz adı) atla
+                    if _MAC_PATTERN.match(mac):
+                        arp_entries.append({"ip": ip, "mac": mac, "interface": interface})
+    
+    return arp_entries
+
+# ip -j neigh çıktısını ayrıştırma
+def parse_ip_neigh_json(output):
+    """
+    `ip -j neigh` JSON çıktısını ayrıştırır.
+    
+    Args:
+        output (str): Komutun JSON çıktısı
+        
+    Returns:
+        list: {"ip", "mac", "interface", "state"} kayıtları listesi
+    """
+    arp_entries = []
+    for neigh in json.loads(output or "[]"):
+        states = neigh.get("state") or ["NONE"]
+        if "NOARP" in states or not neigh.get("lladdr"):
+            continue  # ARP kullanmayan arayüz kayıtlarını ve eksik kayıtları atla
+        arp_entries.append({
+            "ip": neigh["dst"],
+            "mac": neigh["lladdr"],
+            "interface": neigh.get("dev", "unknown"),
+            "state": states[0],
+        })
+    return arp_entries
+
+# ARP tablosunu ip komutunun JSON çıktısıyla alma
+def get_arp_table_ip_json():
+    """
+    ARP tablosunu tek bir `ip -j -4 neigh show` çağrısıyla (durum ve arayüz dahil) alır.
+    
+    Returns:
+        list: {"ip", "mac", "interface", "state"} kayıtları listesi
+    """
+    output = subprocess.check_output(['ip', '-j', '-4', 'neigh', 'show'], text=True,
+                                     stderr=subprocess.DEVNULL)
+    return parse_ip_neigh_json(output)
+
+# ARP tablosu kaynakları (tercih sırasına göre)
+ARP_TABLE_SOURCES = {
+    "netlink": get_arp_table_netlink,
+    "proc": get_arp_table_proc,
+    "ip_json": get_arp_table_ip_json,
+    "arp": get_arp_table_command,
+}
+
+# Komşu durumunu (REACHABLE/STALE/FAILED) bildiren kaynaklar; seçimde öncelikli
+# (/proc/net/arp ve arp komutu durum bilgisi taşımaz, FAILED kuralı çalışmaz)
+ARP_TABLE_SOURCES_WITH_STATE = {"netlink", "ip_json"}
+
+# Başlangıçta seçilen kaynak
+_arp_table_source = None
+_arp_table_source_lock = threading.Lock()
+
+class ARPTableError(Exception):
+    """Hiçbir ARP tablosu kaynağı çalışmadığında fırlatılır"""
+    pass
+
+# ARP tablosu kaynaklarını karşılaştırma
+def benchmark_arp_table(iterations=100, sources=None):
+    """
+    Kayıtlı ARP tablosu kaynaklarının hızını karşılaştırır.
+    
+    Args:
+        iterations (int): Her kaynak için tekrar sayısı
+        sources (dict): Kaynak adı -> fonksiyon; None ise ARP_TABLE_SOURCES
+        
+    Returns:
+        dict: Kaynak adı -> çağrı başına ortalama süre (saniye); çalışmayan kaynaklar None
+    """
+    if sources is None:
+        sources = ARP_TABLE_SOURCES
+    results = {}
+    for name, source in sources.items():
+        try:
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                source()
+            results[name] = (time.perf_counter() - start_time) / iterations
+            logger.info(f"ARP kaynağı '{name}': çağrı başına {results[name] * 1e6:.1f} µs")
+        except Exception as e:
+            logger.debug(f"ARP kaynağı '{name}' ölçülemedi: {e}")
+            results[name] = None
+    return results
+
+# En hızlı çalışan kaynağı seçme
+def select_arp_table_source(iterations=3):
+    """
+    Tüm kaynakları dener ve seçilen kaynağı sonraki çağrılar için hatırlar.
+    
+    Komşu durumunu bildiren kaynaklar her zaman durum bilgisi olmayanlardan
+    önce gelir; hız sadece aynı yetenekteki kaynaklar arasında belirleyicidir.
+    Böylece seçim ölçüm gürültüsüyle çalıştırmadan çalıştırmaya değişmez.
+    
+    Args:
+        iterations (int): Her kaynak için ölçüm tekrarı
+        
+    Returns:
+        str: Seçilen kaynağın adı
+        
+    Raises:
+        ARPTableError: Hiçbir kaynak çalışmıyorsa
+    """
+    global _arp_table_source
+    
+    timings = benchmark_arp_table(iterations)
+    working = {name: elapsed for name, elapsed in timings.items() if elapsed is not None}
+    if not working:
+        raise ARPTableError("Hiçbir ARP tablosu kaynağı çalışmıyor: " + ", ".join(timings))
+    
+    with _arp_table_source_lock:
+        _arp_table_source = min(working, key=lambda name: (name not in ARP_TABLE_SOURCES_WITH_STATE,
+                                                           working[name]))
+    logger.info(f"ARP tablosu kaynağı seçildi: {_arp_table_source}")
+    return _arp_table_source
+
+# ARP tablosunu alma
+def get_arp_table(source=None):
+    """
+    Sistemin ARP tablosunu alır.
+    
+    İlk çağrıda tüm kaynaklar denenip durum bildirenler arasından en hızlı
+    çalışan seçilir. Seçilen kaynak daha sonra hata verirse kaynaklar bir kez
+    yeniden denenir.
+    
+    Args:
+        source (str): Kullanılacak kaynağın adı (ARP_TABLE_SOURCES); None ise otomatik
+        
+    Returns:
+        list: ARP tablosundaki kayıtlar listesi
+        
+    Raises:
+        ARPTableError: Hiçbir kaynak çalışmıyorsa
+    """
+    if source is not None:
+        arp_entries = ARP_TABLE_SOURCES[source]()
+        logger.debug(f"ARP tablosu alındı ({source}): {len(arp_entries)} kayıt")
+        return arp_entries
+    
+    if _arp_table_source is None:
+        select_arp_table_source()
+    
+    try:
+        arp_entries = ARP_TABLE_SOURCES[_arp_table_source]()
+    except Exception as e:
+        logger.error(f"ARP tablosu kaynağı '{_arp_table_source}' hata verdi: {e}")
+        arp_entries = ARP_TABLE_SOURCES[select_arp_table_source()]()
+    
+    logger.debug(f"ARP tablosu alındı ({_arp_table_source}): {len(arp_entries)} kayıt")
+    return arp_entries
+
+# /proc/net/route dosyasının yolu (Linux)
+PROC_NET_ROUTE = "/proc/net/route"
+
+# Rota bayrakları (linux/route.h)
+RTF_UP = 0x0001
+RTF_GATEWAY = 0x0002
+
+# Varsayılan rota önbelleği: yönlendirme tablosu değişene kadar geçerli
+_route_cache = {"content": None, "route": None}
+_route_cache_lock = threading.Lock()
+
+# /proc/net/route içeriğini ayrıştırma
+def parse_proc_net_route(content):
+    """
+    /proc/net/route içeriğinden varsayılan rotayı bulur.
+    
+    Args:
+        content (str): /proc/net/route dosyasının tamamı
+        
+    Returns:
+        tuple: (gateway IP, arayüz) ya da varsayılan rota yoksa None
+    """
+    best = None
+    best_metric = None
+    # Başlık satırını atla; sütunlar: Iface, Destination, Gateway, Flags, RefCnt, Use, Metric, Mask, ...
+    for line in content.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) < 8:
+            continue
+        flags = int(parts[3], 16)
+        if parts[1] != "00000000" or parts[7] != "00000000":
+            continue  # Varsayılan rota değil
+        if flags & (RTF_UP | RTF_GATEWAY) != (RTF_UP | RTF_GATEWAY):
+            continue
+        metric = int(parts[6])
+        if best_metric is None or metric < best_metric:
+            # Adresler host byte sırasında (little-endian) onaltılık olarak yazılır
+            gateway_ip = socket.inet_ntoa(struct.pack("<I", int(parts[2], 16)))
+            best = (gateway_ip, parts[0])
+            best_metric = metric
+    return best
+
+# Varsayılan rotayı bulma
+def get_default_route(path=PROC_NET_ROUTE):
+    """
+    Varsayılan rotayı /proc/net/route üzerinden kabuk çalıştırmadan bulur.
+    
+    Dosya içeriği bir önceki okumayla aynıysa (yönlendirme tablosu değişmediyse)
+    önbellekteki sonuç döndürülür.
+    
+    Args:
+        path (str): Okunacak dosyanın yolu
+        
+    Returns:
+        tuple: (gateway IP, arayüz) ya da varsayılan rota yoksa None
+    """
+    with open(path, 'r', encoding='ascii', errors='replace') as f:
+        content = f.read()
+    with _route_cache_lock:
+        if content != _route_cache["content"]:
+            _route_cache["route"] = parse_proc_net_route(content)
+            _route_cache["content"] = content
+            logger.debug(f"Yönlendirme tablosu değişti, varsayılan rota: {_route_cache['route']}")
+        return _route_cache["route"]
+
+# Varsayılan ağ geçidini bulma
+def get_default_gateway(arp_table=None):
+    """
+    Varsayılan ağ geçidini (default gateway) bulur.
+    
+    Linux'ta rota /proc/net/route dosyasından okunur ve MAC adresi verilen
+    ARP tablosundan alınır; tablo verilmezse get_arp_table() çağrılır.
+    
+    Args:
+        arp_table (list): Önceden alınmış ARP tablosu (isteğe bağlı)
+        
+    Returns:
+        dict: Ağ geçidi IP ve MAC adresi
+    """
+    try:
+        if sys.platform == 'win32':
+            # Windows üzerinde çalışılıyorsa
+            result = subprocess.check_output('ipconfig', encoding='cp1254', errors='replace')
+            lines = result.splitlines()
+            gateway_ip = None
+            
+            for i, line in enumerate(lines):
+                if "Varsayılan Ağ Geçidi" in line or "Default Gateway" in line:
+                    # Türkçe veya İngilizce arayüzler için kontrol
+                    parts = line.split(":")
+                    if len(parts) > 1:
+                        gateway_ip = parts[1].strip()
+                        break
+            
+            if gateway_ip:
+                # Gateway IP bulundu, şimdi MAC adresini bulalım
+                try:
+                    arp_result = subprocess.check_output(f'arp -a {gateway_ip}', encoding='cp1254', errors='replace', shell=True)
+                    arp_lines = arp_result.splitlines()
+                    
+                    for line in arp_lines:
+                        if gateway_ip in line:
+                            # MAC adresi genellikle ikinci sütundadır
+                            parts = line.split()
+                            if len(parts) >= 2:
+                                gateway_mac = parts[1].replace('-', ':')
+                                logger.debug(f"Gateway bulundu: IP={gateway_ip}, MAC={gateway_mac}")
+                                return {"ip": gateway_ip, "mac": gateway_mac}
+                except Exception as e:
+                    logger.error(f"ARP tablosunda gateway MAC adresi aranırken hata: {e}")
+                    
+                # MAC bulunamadıysa sadece IP ile devam et
+                logger.warning(f"Gateway MAC adresi bulunamadı, sadece IP kullanılıyor: {gateway_ip}")
+                return {"ip": gateway_ip, "mac": "Bilinmiyor"}
+            else:
+                logger.warning("Gateway IP adresi bulunamadı")
+                return {"ip": "Bilinmiyor", "mac": "Bilinmiyor"}
+        else:
+            # Linux üzerinde çalışılıyorsa
+            try:
+                route = get_default_route()
+                if route is None:
+                    logger.warning("Varsayılan rota bulunamadı")
+                    return {"ip": "Bilinmiyor", "mac": "Bilinmiyor"}
+                gateway_ip, interface = route
+                
+                # MAC adresini zaten alınmış komşu tablosundan bul
+                if arp_table is None:
+                    arp_table = get_arp_table()
+                gateway_mac = "Bilinmiyor"
+                if isinstance(arp_table, ARPTable):
+                    for i in arp_table.rows_for_ip(gateway_ip):
+                        gateway_mac = int_to_mac(arp_table.macs[i])
+                        if arp_table.interface_name(i) == interface:
+                            break
+                else:
+                    for entry in arp_table:
+                        if entry["ip"] == gateway_ip and entry.get("mac"):
+                            gateway_mac = entry["mac"]
+                            if entry.get("interface") == interface:
+                                break
+                
+                logger.debug(f"Gateway bulundu: IP={gateway_ip}, MAC={gateway_mac}")
+                return {"ip": gateway_ip, "mac": gateway_mac, "interface": interface}
+            except Exception as e:
+                logger.error(f"Linux'ta gateway bilgisi alınırken hata: {e}")
+                return {"ip": "Bilinmiyor", "mac": "Bilinmiyor"}
+            
+    except Exception as e:
+        logger.error(f"Varsayılan ağ geçidi bulunurken hata oluştu: {e}")
+        
+    # Hata durumunda gateway bilinmiyor; sahte veri taban çizgisine öğrenilmesin
+    logger.warning("Ağ geçidi bulunamadı.")
+    return {"ip": "Bilinmiyor", "mac": "Bilinmiyor"}
+
+# Sıkıştırılmış adres gösterimleri
+BROADCAST_MAC = 0xFFFFFFFFFFFF
+
+# Eski metin kontrolüyle uyumlu multicast ilk byte'ları ("01:", "03:", ... "0f:")
+_MULTICAST_FIRST_BYTES = frozenset(range(1, 16, 2))
+
+def ip_to_int(ip):
+    """Noktalı IPv4 adresini 32 bit tamsayıya çevirir."""
+    return struct.unpack("!I", socket.inet_aton(ip))[0]
+
+def int_to_ip(value):
+    """32 bit tamsayıyı noktalı IPv4 adresine çevirir."""
+    return socket.inet_ntoa(struct.pack("!I", value))
+
+def mac_to_int(mac):
+    """
+    MAC adresini (':' ya da '-' ayraçlı) 48 bit tamsayıya çevirir.
+    
+    Raises:
+        ValueError: Altı oktetli geçerli bir MAC adresi değilse
+    """
+    if not _MAC_PATTERN.match(mac):
+        raise ValueError(f"Geçersiz MAC adresi: {mac!r}")
+    if len(mac) == 17:
+        return int(mac[0:2] + mac[3:5] + mac[6:8] + mac[9:11] + mac[12:14] + mac[15:17], 16)
+    # Başında sıfır olmayan biçimler (örn. macOS: 0:1c:42:0:0:8)
+    value = 0
+    for part in re.split(r'[:-]', mac):
+        value = (value << 8) | int(part, 16)
+    return value
+
+def int_to_mac(value):
+    """48 bit tamsayıyı küçük harfli ':' ayraçlı MAC adresine çevirir."""
+    text = f"{value:012x}"
+    return f"{text[0:2]}:{text[2:4]}:{text[4:6]}:{text[6:8]}:{text[8:10]}:{text[10:12]}"
+
+# Tamsayı dizisinde MAC'in ilk byte'ının (en anlamlı 48. bitten itibaren) konumu
+_MAC_FIRST_BYTE_OFFSET = 5 if sys.byteorder == "little" else 2
+
+# İlk byte'ı broadcast ya da multicast olabilecek MAC'leri işaretleyen çeviri tablosu
+_SPECIAL_FIRST_BYTE_FLAGS = bytes(1 if b in _MULTICAST_FIRST_BYTES or b == 0xFF else 0 for b in range(256))
+
+def is_special_mac(mac):
+    """Tamsayı MAC adresi broadcast ya da multicast ise True döndürür."""
+    return mac == BROADCAST_MAC or (mac >> 40) in _MULTICAST_FIRST_BYTES
+
+# Arayüz adları tüm tablolar arasında paylaşılan bir indeksle saklanır
+_interface_names = []
+_interface_index = {}
+_interface_lock = threading.Lock()
+
+def _intern_interface(name):
+    """Arayüz adının paylaşılan indeksteki sırasını döndürür (gerekirse ekler)."""
+    index = _interface_index.get(name)
+    if index is None:
+        with _interface_lock:
+            index = _interface_index.get(name)
+            if index is None:
+                index = len(_interface_names)
+                _interface_names.append(sys.intern(name))
+                _interface_index[name] = index
+    return index
+
+# Komşu durumları için sıkıştırılmış indeksler (0 = durum bilgisi yok)
+_STATE_NAMES = [None, "NONE"] + list(NUD_STATES.values())
+_STATE_INDEX = {name: i for i, name in enumerate(_STATE_NAMES)}
+
+# Sıkıştırılmış ARP tablosu
+# Durum indeksi -> FAILED ise 1 (bytes.translate tablosu)
+_FAILED_STATE_FLAGS = bytes(int(i == _STATE_INDEX["FAILED"]) for i in range(256))
+
+class ARPTable:
+    """
+    ARP tablosunu sütun bazlı tamsayı dizilerinde saklar.
+    
+    IPv4 adresleri 32 bit, MAC adresleri 48 bit tamsayı olarak, arayüzler
+    paylaşılan bir indekse referans olarak tutulur. Kayıt başına birkaç on
+    byte yerine 15 byte kullanılır. Arayüz tarafı için üzerinde gezinildiğinde
+    kayıtlar eski {"ip", "mac", "interface"} sözlük biçiminde üretilir.
+    """
+    __slots__ = ("ips", "macs", "interfaces", "states")
+    
+    def __init__(self):
+        self.ips = array('I')
+        self.macs = array('Q')
+        self.interfaces = array('H')
+        self.states = array('B')
+    
+    @classmethod
+    def from_entries(cls, entries):
+        """
+        Sözlük listesinden tablo oluşturur.
+        
+        Args:
+            entries (iterable): {"ip", "mac", "interface", "state"} kayıtları
+            
+        Returns:
+            ARPTable: Sıkıştırılmış tablo
+        """
+        if isinstance(entries, cls):
+            return entries
+        table = cls()
+        for entry in entries:
+            try:
+                table.append(entry["ip"], entry["mac"], entry.get("interface", "unknown"), entry.get("state"))
+            except (KeyError, TypeError, ValueError, OSError) as e:
+                # Tek bir bozuk satır tüm taramayı düşürmesin
+                logger.debug(f"Geçersiz ARP kaydı atlandı: {entry!r} ({e})")
+        return table
+    
+    def append(self, ip, mac, interface, state=None):
+        """
+        Metin biçimindeki bir kaydı ekler.
+        
+        Raises:
+            ValueError, OSError: IP ya da MAC adresi çevrilemezse (tablo değişmez)
+        """
+        # Sütunlar hizalı kalsın diye önce çevir, sonra ekle
+        ip_value = ip_to_int(ip)
+        mac_value = mac_to_int(mac)
+        self.ips.append(ip_value)
+        self.macs.append(mac_value)
+        self.interfaces.append(_intern_interface(interface))
+        self.states.append(_STATE_INDEX.get(state, 1))
+    
+    def __len__(self):
+        return len(self.ips)
+    
+    def __repr__(self):
+        return f"<ARPTable: {len(self)} kayıt>"
+    
+    def _row(self, i):
+        """i. kaydı eski sözlük biçiminde döndürür"""
+        entry = {
+            "ip": int_to_ip(self.ips[i]),
+            "mac": int_to_mac(self.macs[i]),
+            "interface": _interface_names[self.interfaces[i]],
+        }
+        state = _STATE_NAMES[self.states[i]]
+        if state is not None:
+            entry["state"] = state
+        # Üretici bilgisi satır istendiğinde OUI dizininden bulunur
+        vendor = lookup_vendor(self.macs[i])
+        if vendor is not None:
+            entry["vendor"] = vendor
+        return entry
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._row(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("ARPTable indeksi aralık dışında")
+        return self._row(i)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._row(i)
+    
+    def to_list(self):
+        """Tabloyu eski sözlük listesi biçimine çevirir"""
+        return list(self)
+    
+    def rows_for_ip(self, ip):
+        """Verilen IP adresine ait kayıtların indekslerini döndürür"""
+        target = ip_to_int(ip)
+        indexes = []
+        i = -1
+        while True:
+            try:
+                i = self.ips.index(target, i + 1)
+            except ValueError:
+                return indexes
+            indexes.append(i)
+    
+    def interface_name(self, i):
+        """i. kaydın arayüz adını döndürür"""
+        return _interface_names[self.interfaces[i]]
+    
+    def fingerprint(self):
+        """
+        Tablonun satır sırasından bağımsız içerik özetini döndürür.
+        
+        Satır özetlerinin toplamı kullanılır (sıralama ya da küme kurmadan tek
+        geçiş). Komşu durumlarından sadece tespitte kullanılan FAILED bilgisi
+        katılır; böylece REACHABLE -> STALE gibi geçişler özeti değiştirmez.
+        """
+        failed_flags = self.states.tobytes().translate(_FAILED_STATE_FLAGS)
+        return hash((len(self), sum(map(hash, zip(self.ips, self.macs, self.interfaces, failed_flags)))))
+
+# Bu boyutun üzerindeki tablolarda (NumPy varsa) toplu durumlar vektörel hesaplanır
+VECTORIZED_DETECTION_THRESHOLD = 50000
+
+def _use_numpy(table):
+    """Tablo için vektörel yolun kullanılıp kullanılmayacağını belirler"""
+    return NUMPY_AVAILABLE and len(table) >= VECTORIZED_DETECTION_THRESHOLD
+
+def _first_byte_rows(table, flags):
+    """MAC'in ilk byte'ı çeviri tablosunda işaretli olan satırları (C seviyesinde) bulur"""
+    macs = table.macs
+    first_bytes = macs.tobytes()[_MAC_FIRST_BYTE_OFFSET::macs.itemsize]
+    return list(itertools.compress(range(len(macs)), first_bytes.translate(flags)))
+
+# Kuralların ihtiyaç duyduğu toplu durumlar. Her biri çalıştırma başına en fazla
+# bir kez hesaplanır ve o durumu isteyen tüm kurallar tarafından paylaşılır.
+def _aggregate_special_rows(table, aggregates):
+    """Broadcast ya da multicast MAC'e sahip satırlar (tablo sırasıyla)"""
+    if _use_numpy(table):
+        macs = np.frombuffer(table.macs, dtype=np.uint64)
+        first_bytes = macs >> np.uint64(40)
+        special = (macs == np.uint64(BROADCAST_MAC)) | ((first_bytes < 16) & ((first_bytes & np.uint64(1)) == 1))
+        return np.flatnonzero(special).tolist()
+    return [i for i in _first_byte_rows(table, _SPECIAL_FIRST_BYTE_FLAGS) if is_special_mac(table.macs[i])]
+
+def _aggregate_repeated_macs(table, aggregates):
+    """Birden fazla IP'si olan (özel olmayan) MAC -> IP listesi, ilk görülme sırasıyla"""
+    special_macs = {table.macs[i] for i in aggregates["special_rows"]}
+    repeated = {}
+    
+    if _use_numpy(table):
+        ips = np.frombuffer(table.ips, dtype=np.uint32)
+        macs = np.frombuffer(table.macs, dtype=np.uint64)
+        normal = np.ones(len(macs), dtype=bool)
+        normal[aggregates["special_rows"]] = False
+        normal_rows = np.flatnonzero(normal)
+        unique_macs, first_index, inverse, counts = np.unique(
+            macs[normal_rows], return_index=True, return_inverse=True, return_counts=True)
+        is_repeated = counts > 1
+        if is_repeated.any():
+            rows = normal_rows[is_repeated[inverse]]
+            groups = inverse[is_repeated[inverse]]
+            # Kararlı sıralama: grup içinde IP'ler tablo sırasında kalır
+            order = np.argsort(groups, kind="stable")
+            rows = rows[order]
+            group_ids, starts = np.unique(groups[order], return_index=True)
+            bounds = np.append(starts, len(rows))
+            for g in np.argsort(first_index[group_ids], kind="stable").tolist():
+                repeated[int(unique_macs[group_ids[g]])] = ips[rows[bounds[g]:bounds[g + 1]]].tolist()
+        return repeated
+    
+    # Sayım ve süzme C seviyesinde; Python döngüsü sadece tekrar eden satırlara uğrar
+    macs = table.macs
+    counts = Counter(macs)
+    if len(counts) < len(macs):
+        repeated_macs = set(itertools.compress(counts, map((1).__lt__, counts.values()))) - special_macs
+        for i in itertools.compress(range(len(macs)), map(repeated_macs.__contains__, macs)):
+            repeated.setdefault(macs[i], []).append(table.ips[i])
+    return repeated
+
+# Toplu durum adı -> (hesaplama fonksiyonu, bağımlılıklar)
+RULE_AGGREGATES = {
+    "special_rows": (_aggregate_special_rows, ()),
+    "repeated_macs": (_aggregate_repeated_macs, ("special_rows",)),
+}
+
+# Tespit kuralları
+# Güvenilir IP-MAC eşlemeleri dosyası
+TRUSTED_BINDINGS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "trusted_bindings.json")
+
+class TrustedBindings:
+    """
+    Bilinen (sabitlenmiş) IP-MAC eşlemelerini ve birden fazla IP'ye izin verilen
+    MAC adreslerini tutar.
+    
+    Dosya biçimi:
+        {
+            "pinned": {"192.168.1.1": "aa:bb:cc:dd:ee:ff",
+                       "192.168.1.10": ["aa:bb:cc:00:00:01", "aa:bb:cc:00:00:02"]},
+            "multi_ip_macs": ["aa:bb:cc:00:00:03"]
+        }
+    
+    Eşlemeler tamsayı anahtarlı sözlük/kümelerde tutulur, sorgular sabit
+    zamanlıdır. Dosya değiştiğinde (mtime/boyut) bir sonraki taramada yeniden
+    yüklenir; hatalı dosyada önceki eşlemeler korunur.
+    """
+    def __init__(self, path=TRUSTED_BINDINGS_FILE):
+        self.path = path
+        self.pinned = {}  # IP (int) -> izin verilen MAC'ler (frozenset, int)
+        self.multi_ip_macs = frozenset()  # Birden fazla IP'si olabilen MAC'ler (int)
+        self.signature = None
+        self.logger = logging.getLogger("V-ARP.TrustedBindings")
+        self.reload_if_changed()
+    
+    def reload_if_changed(self):
+        """
+        Dosya değiştiyse eşlemeleri yeniden yükler.
+        
+        Returns:
+            bool: Eşlemeler yenilendiyse True
+        """
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature == self.signature:
+            return False
+        self.signature = signature
+        
+        # Dosya kaldırıldıysa sabitlemeler de kalkar
+        if signature is None:
+            self.pinned = {}
+            self.multi_ip_macs = frozenset()
+            return True
+        
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            pinned = {}
+            for ip, macs in data.get("pinned", {}).items():
+                if isinstance(macs, str):
+                    macs = [macs]
+                pinned[ip_to_int(ip)] = frozenset(mac_to_int(mac) for mac in macs)
+            multi_ip_macs = frozenset(mac_to_int(mac) for mac in data.get("multi_ip_macs", []))
+        except Exception as e:
+            self.logger.error(f"Güvenilir eşlemeler yüklenirken hata, önceki liste kullanılıyor: {e}")
+            return False
+        
+        # Okuyan thread'ler her zaman tutarlı bir çift görsün diye birlikte değiştir
+        self.pinned, self.multi_ip_macs = pinned, multi_ip_macs
+        self.logger.info(f"Güvenilir eşlemeler yüklendi: {len(pinned)} sabit IP, "
+                         f"{len(multi_ip_macs)} çoklu IP izni")
+        return True
+    
+    def allows_multiple_ips(self, mac, ips):
+        """
+        MAC adresinin birden fazla IP'si olmasına izin verilip verilmediğini döndürür.
+        
+        Listede açıkça izinli olan ya da tüm IP'leri bu MAC'e sabitlenmiş
+        adresler meşru kabul edilir.
+        
+        Args:
+            mac (int): MAC adresi
+            ips (list): MAC'in IP adresleri (int)
+        """
+        if mac in self.multi_ip_macs:
+            return True
+        pinned = self.pinned
+        return all(mac in pinned.get(ip, ()) for ip in ips)
+
+class DetectionRule:
+    """
+    Tespit kuralı temel sınıfı.
+    
+    Bir kural ihtiyaç duyduğu toplu durumları `requires` ile bildirir ve
+    bulgularını evaluate() içinde üretir. Satır bazlı kontrol gereken kurallar
+    `per_entry = True` tanımlayıp check_entry() uygular; tüm bu kurallar
+    motorun tek ortak geçişinde birlikte çalıştırılır ve satır bulguları
+    summarize() ile kuralın son bulgularına dönüştürülür.
+    """
+    name = "rule"
+    requires = ()
+    per_entry = False
+    
+    def check_entry(self, table, i):
+        """Tek bir satırı kontrol eder; bulgu ya da None döndürür"""
+        return None
+    
+    def summarize(self, findings):
+        """Ortak geçişte toplanan satır bulgularını son hâline getirir"""
+        return findings
+    
+    def evaluate(self, table, aggregates, context):
+        """Toplu durumlardan bulguları üretir"""
+        return []
+
+class MultipleIPsRule(DetectionRule):
+    """Bir MAC adresinin birden fazla IP'si varsa (1'den çok cihaz olabilir)"""
+    name = "multiple_ips"
+    requires = ("repeated_macs",)
+    
+    def evaluate(self, table, aggregates, context):
+        findings = []
+        trusted = context.get("trusted")
+        for mac, ips in aggregates["repeated_macs"].items():
+            # Aynı cihazın bilinen birden fazla IP'si (ör. sunucu) saldırı değildir
+            if trusted is not None and trusted.allows_multiple_ips(mac, ips):
+                continue
+            mac_text = int_to_mac(mac)
+            ip_texts = [int_to_ip(ip) for ip in ips]
+            findings.append({
+                "type": "multiple_ips",
+                "mac": mac_text,
+                "ips": ip_texts,
+                "threat_level": "medium",
+                "message": f"⚠️ Şüpheli: {mac_text} MAC adresine sahip {len(ip_texts)} farklı IP adresi var: {', '.join(ip_texts)}"
+            })
+        return findings
+
+class GatewayMultipleMACsRule(DetectionRule):
+    """Ağ geçidi IP'si için birden fazla MAC adresi varsa"""
+    name = "gateway_multiple_macs"
+    
+    def evaluate(self, table, aggregates, context):
+        gateway = context["gateway"]
+        if gateway["ip"] == "Bilinmiyor" or gateway["mac"] == "Bilinmiyor":
+            return []
+        rows = table.rows_for_ip(gateway["ip"])
+        if len(rows) < 2:
+            return []
+        return [{
+            "type": "gateway_multiple_macs",
+            "ip": gateway["ip"],
+            "macs": [int_to_mac(table.macs[i]) for i in rows],
+            "threat_level": "high",
+            "message": f"❌ TEHLİKE: Ağ geçidi {gateway['ip']} için birden fazla MAC adresi var!"
+        }]
+
+class PinnedBindingRule(DetectionRule):
+    """Sabitlenmiş bir IP'nin tabloda izin verilmeyen bir MAC ile görülmesi"""
+    name = "pinned_bindings"
+    
+    def evaluate(self, table, aggregates, context):
+        trusted = context.get("trusted")
+        if trusted is None or not trusted.pinned:
+            return []
+        pinned = trusted.pinned
+        findings = []
+        # Sabit IP'lerin satırlarını C düzeyinde süz, sadece onları incele
+        for i in itertools.compress(range(len(table)), map(pinned.__contains__, table.ips)):
+            mac = table.macs[i]
+            allowed = pinned[table.ips[i]]
+            if mac == 0 or mac in allowed:
+                continue
+            ip_text = int_to_ip(table.ips[i])
+            mac_text = int_to_mac(mac)
+            findings.append({
+                "type": "pinned_binding_violation",
+                "ip": ip_text,
+                "mac": mac_text,
+                "macs": sorted(int_to_mac(value) for value in allowed),
+                "threat_level": "high",
+                "message": f"❌ TEHLİKE: Sabitlenmiş {ip_text} adresi beklenmeyen MAC ile görüldü: {mac_text}"
+            })
+        return findings
+
+class SpecialMACInfoRule(DetectionRule):
+    """Bilgi amaçlı broadcast/multicast MAC kayıtları (saldırı değil)"""
+    name = "special_macs"
+    requires = ("special_rows",)
+    
+    def evaluate(self, table, aggregates, context):
+        return [_info_entry(int_to_ip(table.ips[i]), table.macs[i]) for i in aggregates["special_rows"]]
+
+class LocallyAdministeredMACRule(DetectionRule):
+    """
+    Bilgi amaçlı yerel yönetimli MAC kayıtları (rastgele MAC, sanal arayüz ya da taklit).
+    
+    Telefonların rastgele MAC kullandığı ağlarda her cihaz için ayrı kart
+    çıkmasın diye tüm kayıtlar tek bir özet bulguda birleştirilir; özette
+    en fazla `max_listed` adres listelenir, toplam sayı `count` alanındadır.
+    """
+    name = "locally_administered"
+    per_entry = True
+    max_listed = 50
+    
+    def check_entry(self, table, i):
+        # U/L biti 1, I/G biti 0 (tekil) olan adresler
+        mac = table.macs[i]
+        if (mac >> 40) & 0x03 != 0x02:
+            return None
+        return (table.ips[i], mac)
+    
+    def summarize(self, findings):
+        if not findings:
+            return []
+        listed = findings[:self.max_listed]
+        ip_texts = [int_to_ip(ip) for ip, _ in listed]
+        mac_texts = [int_to_mac(mac) for _, mac in listed]
+        shown = ", ".join(ip_texts[:5]) + ("..." if len(findings) > 5 else "")
+        return [{
+            "type": "info_locally_administered",
+            "ips": ip_texts,
+            "macs": mac_texts,
+            "count": len(findings),
+            "threat_level": "none",
+            "message": f"📌 Bilgi: {len(findings)} cihaz yerel yönetimli MAC adresi kullanıyor: {shown}"
+        }]
+
+class FailedNeighborRule(DetectionRule):
+    """Bilgi amaçlı çözümlenemeyen (FAILED) komşu kayıtları"""
+    name = "failed_neighbors"
+    per_entry = True
+    
+    def check_entry(self, table, i):
+        if table.states[i] != _STATE_INDEX["FAILED"]:
+            return None
+        ip_text = int_to_ip(table.ips[i])
+        mac_text = int_to_mac(table.macs[i])
+        return {
+            "type": "info_failed_neighbor",
+            "ip": ip_text,
+            "mac": mac_text,
+            "threat_level": "none",
+            "message": f"📌 Bilgi: Yanıt vermeyen komşu (FAILED): IP={ip_text}, son MAC={mac_text}"
+        }
+
+# Varsayılan kurallar (bulgular bu sırayla üretilir)
+DEFAULT_RULES = (
+    MultipleIPsRule,
+    GatewayMultipleMACsRule,
+    PinnedBindingRule,
+    SpecialMACInfoRule,
+    LocallyAdministeredMACRule,
+    FailedNeighborRule,
+)
+
+class RuleEngine:
+    """
+    Kayıtlı kuralları tablo üzerinde birlikte çalıştırır.
+    
+    Kuralların istediği toplu durumlar bir kez hesaplanıp paylaşılır; satır
+    bazlı kurallar tek bir ortak geçişte değerlendirilir. Böylece yeni bir
+    kural eklemek tablo üzerinde yeni bir geçiş eklemez. Son çalıştırmanın
+    kural ve toplu durum süreleri `timings` içinde tutulur. Verilen güvenilir
+    eşlemeler her çalıştırmada değişiklik için kontrol edilip kurallara
+    `context["trusted"]` olarak aktarılır.
+    """
+    def __init__(self, rules=None, trusted_bindings=None):
+        self.rules = [rule() for rule in DEFAULT_RULES] if rules is None else list(rules)
+        self.trusted_bindings = trusted_bindings
+        self.timings = {}
+    
+    def register(self, rule):
+        """Yeni bir kural ekler"""
+        self.rules.append(rule)
+    
+    def _required_aggregates(self):
+        """Kuralların istediği toplu durumları bağımlılık sırasıyla döndürür"""
+        ordered = []
+        
+        def add(name):
+            if name in ordered:
+                return
+            for dependency in RULE_AGGREGATES[name][1]:
+                add(dependency)
+            ordered.append(name)
+        
+        for rule in self.rules:
+            for name in rule.requires:
+                add(name)
+        return ordered
+    
+    def run(self, table, gateway):
+        """
+        Tüm kuralları çalıştırır.
+        
+        Args:
+            table (ARPTable): Sıkıştırılmış ARP tablosu
+            gateway (dict): Ağ geçidi bilgisi
+            
+        Returns:
+            list: Kural sırasıyla tespit edilen şüpheli durumlar
+        """
+        timings = {}
+        trusted = self.trusted_bindings
+        if trusted is not None:
+            trusted.reload_if_changed()
+        context = {"gateway": gateway, "trusted": trusted}
+        
+        # Toplu durumları bir kez hesapla
+        aggregates = {}
+        for name in self._required_aggregates():
+            start_time = time.perf_counter()
+            aggregates[name] = RULE_AGGREGATES[name][0](table, aggregates)
+            timings[f"aggregate:{name}"] = time.perf_counter() - start_time
+        
+        # Satır bazlı kuralları tek ortak geçişte çalıştır
+        entry_findings = {}
+        entry_rules = [rule for rule in self.rules if rule.per_entry]
+        if entry_rules:
+            start_time = time.perf_counter()
+            checks = [(rule.check_entry, entry_findings.setdefault(rule.name, []).append)
+                      for rule in entry_rules]
+            for i in range(len(table)):
+                for check, collect in checks:
+                    finding = check(table, i)
+                    if finding is not None:
+                        collect(finding)
+            timings["entry_pass"] = time.perf_counter() - start_time
+        
+        findings = []
+        for rule in self.rules:
+            start_time = time.perf_counter()
+            if rule.per_entry:
+                findings.extend(rule.summarize(entry_findings[rule.name]))
+            findings.extend(rule.evaluate(table, aggregates, context))
+            timings[rule.name] = time.perf_counter() - start_time
+        
+        self.timings = timings
+        return findings
+
+# Varsayılan kural motoru
+default_rule_engine = RuleEngine()
+
+# ARP spoofing tespiti
+def detect_arp_spoofing(arp_table, gateway=None, engine=None):
+    """
+    ARP tablosunu inceleyerek olası ARP spoofing saldırılarını tespit eder.
+    
+    Args:
+        arp_table (ARPTable | list): ARP tablosu kayıtları
+        gateway (dict): Önceden bulunmuş ağ geçidi; verilmezse tablodan bulunur
+        engine (RuleEngine): Kullanılacak kural motoru; None ise varsayılan motor
+        
+    Returns:
+        list: Tespit edilen şüpheli durumlar
+    """
+    table = ARPTable.from_entries(arp_table)
+    if gateway is None:
+        gateway = get_default_gateway(table)
+    if engine is None:
+        engine = default_rule_engine
+    return engine.run(table, gateway)
+
+def _info_entry(ip_text, mac):
+    """Broadcast/multicast MAC için bilgi amaçlı kaydı oluşturur"""
+    mac_text = int_to_mac(mac)
+    if mac == BROADCAST_MAC:
+        return {
+            "type": "info_broadcast",
+            "ip": ip_text,
+            "mac": mac_text,
+            "threat_level": "none",
+            "message": f"📌 Bilgi: Broadcast MAC adresi: IP={ip_text}, MAC={mac_text}"
+        }
+    return {
+        "type": "info_multicast",
+        "ip": ip_text,
+        "mac": mac_text,
+        "threat_level": "none",
+        "message": f"📌 Bilgi: Multicast MAC adresi: IP={ip_text}, MAC={mac_text}"
+    }
+
+# Genel tehdit seviyesini belirleme
+def get_threat_level(suspicious):
+    """
+    Şüpheli durumlar listesinden genel tehdit seviyesini belirler.
+    
+    Args:
+        suspicious (list): Tespit edilen şüpheli durumlar
+        
+    Returns:
+        str: "high", "medium" ya da "none"
+    """
+    # Yüksek tehdit varsa seviyeyi yükselt
+    if any(entry.get("threat_level") == "high" for entry in suspicious):
+        return "high"
+    # Orta seviye tehdit varsa ve henüz yüksek seviye tespit edilmediyse
+    if any(entry.get("threat_level") == "medium" for entry in suspicious):
+        return "medium"
+    return "none"
+
+# Ethernet/ARP sabitleri (linux/if_ether.h, linux/if_arp.h)
+ETH_P_ARP = 0x0806
+ETH_P_8021Q = 0x8100
+ARPHRD_ETHER = 1
+ARPOP_REQUEST = 1
+ARPOP_REPLY = 2
+
+# Ethernet başlığı ve IPv4/Ethernet ARP gövdesi
+_ETH_HEADER = struct.Struct("!6s6sH")
+_ARP_PACKET = struct.Struct("!HHBBH6s4s6s4s")
+
+# Bir isteğin yanıtı ne kadar süre bekleyebilir (saniye)
+ARP_REQUEST_TIMEOUT = 5.0
+
+# Ham ARP çerçevesini ayrıştırma
+def parse_arp_frame(frame, timestamp=None):
+    """
+    Ham bir Ethernet çerçevesinden IPv4 ARP paketini ayrıştırır.
+    
+    Args:
+        frame (bytes): Ethernet başlığı dahil çerçeve
+        timestamp (float): Paketin alındığı zaman
+        
+    Returns:
+        dict: ARP paketi bilgileri ya da ARP olmayan çerçevelerde None
+    """
+    view = memoryview(frame)
+    if len(view) < _ETH_HEADER.size + _ARP_PACKET.size:
+        return None
+    _eth_dst, eth_src, ethertype = _ETH_HEADER.unpack_from(view, 0)
+    offset = _ETH_HEADER.size
+    # VLAN etiketli çerçeveleri destekle
+    if ethertype == ETH_P_8021Q:
+        if len(view) < offset + 4 + _ARP_PACKET.size:
+            return None
+        ethertype = struct.unpack_from("!H", view, offset + 2)[0]
+        offset += 4
+    if ethertype != ETH_P_ARP:
+        return None
+    
+    (htype, ptype, hlen, plen, op,
+     sender_mac, sender_ip, target_mac, target_ip) = _ARP_PACKET.unpack_from(view, offset)
+    if htype != ARPHRD_ETHER or ptype != 0x0800 or hlen != 6 or plen != 4:
+        return None
+    
+    return {
+        "timestamp": timestamp if timestamp is not None else time.time(),
+        "op": op,
+        "eth_src": format_mac(eth_src),
+        "sender_mac": format_mac(sender_mac),
+        "sender_ip": format_ip(sender_ip),
+        "target_mac": format_mac(target_mac),
+        "target_ip": format_ip(target_ip),
+    }
+
+# ARP çerçevelerini dinleyen soket
+def open_arp_sniffer_socket(interface=None, replies_only=False, sender_ip=None):
+    """
+    Sadece ARP çerçevelerini alan bir AF_PACKET soketi açar (root yetkisi gerekir).
+    
+    Sokete çekirdek tarafında çalışan bir BPF filtresi bağlanır; filtreye
+    uymayan çerçeveler Python döngüsü uyanmadan düşürülür.
+    
+    Args:
+        interface (str): Dinlenecek arayüz; None ise tüm arayüzler
+        replies_only (bool): Sadece ARP yanıtlarını al
+        sender_ip (str): Sadece bu IP'nin gönderdiği ARP paketlerini al
+        
+    Returns:
+        socket.socket: Ham ARP soketi
+    """
+    sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP))
+    try:
+        attach_bpf_filter(sock, compile_arp_bpf(replies_only, sender_ip))
+        if interface:
+            sock.bind((interface, ETH_P_ARP))
+        # Filtre bağlanmadan önce kuyruğa girmiş çerçevelerin sayacını sıfırla
+        get_packet_statistics(sock)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+# Klasik BPF sabitleri (linux/filter.h, linux/if_packet.h)
+SO_ATTACH_FILTER = 26
+SOL_PACKET = 263
+PACKET_STATISTICS = 6
+BPF_LD_H_ABS = 0x28   # ldh [k]
+BPF_LD_W_ABS = 0x20   # ld [k]
+BPF_JEQ_K = 0x15      # jeq #k, jt, jf
+BPF_RET_K = 0x06      # ret #k
+_SOCK_FILTER = struct.Struct("=HBBI")
+_TPACKET_STATS = struct.Struct("=II")
+
+# Çekirdekte çalışacak ARP filtresini derleme
+def compile_arp_bpf(replies_only=False, sender_ip=None):
+    """
+    Sadece ARP çerçevelerini kabul eden klasik BPF programını derler.
+    
+    Args:
+        replies_only (bool): Sadece ARP yanıtlarını kabul et
+        sender_ip (str): Sadece bu IP'den gönderilen ARP paketlerini kabul et (örn. gateway)
+        
+    Returns:
+        list: (code, jt, jf, k) komutları listesi
+    """
+    # Koşullar: (offset, yükleme komutu, beklenen değer)
+    checks = [(12, BPF_LD_H_ABS, ETH_P_ARP)]  # EtherType
+    if replies_only:
+        checks.append((20, BPF_LD_H_ABS, ARPOP_REPLY))  # ARP opcode
+    if sender_ip:
+        checks.append((28, BPF_LD_W_ABS, struct.unpack("!I", socket.inet_aton(sender_ip))[0]))  # Gönderen IP
+    
+    program = []
+    for i, (offset, load, value) in enumerate(checks):
+        remaining = len(checks) - i - 1
+        program.append((load, 0, 0, offset))
+        # Eşleşmezse kalan kontrolleri ve kabul komutunu atlayıp reddet
+        program.append((BPF_JEQ_K, 0, remaining * 2 + 1, value))
+    program.append((BPF_RET_K, 0, 0, 0x40000))  # Kabul et (tüm çerçeve)
+    program.append((BPF_RET_K, 0, 0, 0))  # Reddet
+    return program
+
+def attach_bpf_filter(sock, program):
+    """
+    Derlenmiş BPF programını SO_ATTACH_FILTER ile sokete bağlar.
+    
+    Args:
+        sock (socket.socket): AF_PACKET soketi
+        program (list): compile_arp_bpf çıktısı
+    """
+    code = b"".join(_SOCK_FILTER.pack(*insn) for insn in program)
+    buffer = ctypes.create_string_buffer(code, len(code))
+    # struct sock_fprog { unsigned short len; struct sock_filter *filter; }
+    fprog = struct.pack("HP", len(program), ctypes.addressof(buffer))
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, fprog)
+
+def get_packet_statistics(sock):
+    """
+    Soketin çekirdek sayaçlarını (PACKET_STATISTICS) okur.
+    
+    Çekirdek sayaçları her okumada sıfırlar; dönen değerler son okumadan bu yana geçerlidir.
+    
+    Args:
+        sock (socket.socket): AF_PACKET soketi
+        
+    Returns:
+        dict: {"packets": alınan, "drops": çekirdekte düşürülen}
+    """
+    packets, drops = _TPACKET_STATS.unpack(sock.getsockopt(SOL_PACKET, PACKET_STATISTICS, _TPACKET_STATS.size))
+    return {"packets": packets, "drops": drops}
+
+# Paket işleme hattı: çerçeve -> ARP paketi -> bulgu
+def sniff_frames(sock, stop_event, idle_timeout=1.0):
+    """
+    Soketten çerçeveleri okuyup üreten generator.
+    
+    Boşta geçen her idle_timeout süresinde None üretilir; böylece sonraki
+    aşamalar bekleyen işleri boşaltabilir ve durdurma sinyali kontrol edilir.
+    
+    Args:
+        sock (socket.socket): Ham ARP soketi
+        stop_event (threading.Event): Durdurma sinyali
+        idle_timeout (float): Boşta bekleme süresi (saniye)
+        
+    Yields:
+        tuple: (zaman damgası, çerçeve) ya da boşta None
+    """
+    buffer = bytearray(65536)
+    view = memoryview(buffer)
+    while not stop_event.is_set():
+        readable, _, _ = select.select([sock], [], [], idle_timeout)
+        if not readable:
+            yield None
+            continue
+        nbytes = sock.recv_into(buffer)
+        yield time.time(), view[:nbytes]
+
+def parse_arp_packets(frames):
+    """
+    Çerçeve akışını ARP paketi akışına çeviren generator.
+    
+    Args:
+        frames (iterable): sniff_frames çıktısı
+        
+    Yields:
+        dict: ARP paketi ya da boşta None
+    """
+    for item in frames:
+        if item is None:
+            yield None
+            continue
+        packet = parse_arp_frame(item[1], item[0])
+        if packet is not None:
+            yield packet
+
+def detect_arp_packets(packets, detector):
+    """
+    ARP paketi akışını durum bilgili dedektörden geçiren generator.
+    
+    Args:
+        packets (iterable): parse_arp_packets çıktısı
+        detector (ARPPacketDetector): Durum bilgili dedektör
+        
+    Yields:
+        list: Her paket için bulgular (boşta boş liste)
+    """
+    for packet in packets:
+        if packet is None:
+            yield []
+            continue
+        yield detector.process(packet)
+
+# PACKET_MMAP (TPACKET_V3) sabitleri (linux/if_packet.h)
+PACKET_RX_RING = 5
+PACKET_VERSION = 10
+TPACKET_V3 = 2
+TP_STATUS_KERNEL = 0
+TP_STATUS_USER = 1
+_TPACKET_REQ3 = struct.Struct("=7I")
+_BLOCK_HEADER = struct.Struct("=III")  # block_status, num_pkts, offset_to_first_pkt
+_BLOCK_HEADER_OFFSET = 8  # version ve offset_to_priv alanlarından sonra
+_TPACKET3_HDR = struct.Struct("=IIIIIIH")  # next_offset, sec, nsec, snaplen, len, status, mac
+
+# Bellek eşlemeli halka tamponla ARP yakalama
+class TPacketV3Ring:
+    """
+    TPACKET_V3 halka tamponu üzerinden ARP çerçevelerini blok blok okur.
+    
+    Çekirdek paketleri doğrudan paylaşılan belleğe yazar; her blok tek bir
+    uyanmada işlenir ve çerçeveler kopyalanmadan memoryview dilimleri olarak
+    üretilir. Üretilen dilimler yalnızca bir sonraki çerçeve istenene kadar
+    geçerlidir (blok ardından çekirdeğe geri verilir).
+    """
+    def __init__(self, interface=None, replies_only=False, sender_ip=None,
+                 block_size=1 << 18, block_nr=64, frame_size=2048, retire_timeout_ms=100):
+        self.block_size = block_size
+        self.block_nr = block_nr
+        self.sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP))
+        try:
+            attach_bpf_filter(self.sock, compile_arp_bpf(replies_only, sender_ip))
+            self.sock.setsockopt(SOL_PACKET, PACKET_VERSION, TPACKET_V3)
+            request = _TPACKET_REQ3.pack(block_size, block_nr, frame_size,
+                                         block_size // frame_size * block_nr,
+                                         retire_timeout_ms, 0, 0)
+            self.sock.setsockopt(SOL_PACKET, PACKET_RX_RING, request)
+            if interface:
+                self.sock.bind((interface, ETH_P_ARP))
+            self.ring = mmap.mmap(self.sock.fileno(), block_size * block_nr,
+                                  mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+            get_packet_statistics(self.sock)
+        except OSError:
+            self.sock.close()
+            raise
+    
+    def frames(self, stop_event, idle_timeout=1.0):
+        """
+        Halka tampondaki çerçeveleri üreten generator (sniff_frames ile aynı sözleşme).
+        
+        Args:
+            stop_event (threading.Event): Durdurma sinyali
+            idle_timeout (float): Boşta bekleme süresi (saniye)
+            
+        Yields:
+            tuple: (zaman damgası, çerçeve memoryview'i) ya da boşta None
+        """
+        view = memoryview(self.ring)
+        block = 0
+        try:
+            while not stop_event.is_set():
+                base = block * self.block_size
+                status, num_pkts, offset = _BLOCK_HEADER.unpack_from(view, base + _BLOCK_HEADER_OFFSET)
+                if not status & TP_STATUS_USER:
+                    # Blok henüz çekirdekte; soket okunabilir olana kadar bekle
+                    readable, _, _ = select.select([self.sock], [], [], idle_timeout)
+                    if not readable:
+                        yield None
+                    continue
+                
+                pos = base + offset
+                for _ in range(num_pkts):
+                    next_offset, sec, nsec, snaplen, _len, _status, mac = _TPACKET3_HDR.unpack_from(view, pos)
+                    start = pos + mac
+                    frame = view[start:start + snaplen]
+                    try:
+                        yield sec + nsec * 1e-9, frame
+                    finally:
+                        frame.release()
+                    pos += next_offset
+                
+                # Bloğu çekirdeğe geri ver ve sıradakine geç
+                struct.pack_into("=I", view, base + _BLOCK_HEADER_OFFSET, TP_STATUS_KERNEL)
+                block = (block + 1) % self.block_nr
+        finally:
+            view.release()
+    
+    def close(self):
+        """Halka tamponu ve soketi kapatır"""
+        self.ring.close()
+        self.sock.close()
+
+# Yakalama motorlarını karşılaştırma
+def benchmark_capture(interface="lo", duration=2.0):
+    """
+    recv tabanlı yakalama ile TPACKET_V3 halka tamponunun sürdürülebilir
+    paket/saniye değerini karşılaştırır (root yetkisi gerekir).
+    
+    Arayüze ayrı bir thread'den olabildiğince hızlı sahte ARP yanıtları
+    gönderilir ve her motor bunları aynı tespit hattından geçirir.
+    
+    Args:
+        interface (str): Test trafiğinin gönderileceği arayüz
+        duration (float): Her motor için ölçüm süresi (saniye)
+        
+    Returns:
+        dict: Motor adı -> {"pps", "packets", "drops"}
+    """
+    frame = (_ETH_HEADER.pack(b"\xff" * 6, b"\x02\x00\x00\x00\x00\x01", ETH_P_ARP) +
+             _ARP_PACKET.pack(ARPHRD_ETHER, 0x0800, 6, 4, ARPOP_REPLY,
+                              b"\x02\x00\x00\x00\x00\x01", socket.inet_aton("10.255.0.1"),
+                              b"\x02\x00\x00\x00\x00\x02", socket.inet_aton("10.255.0.2")))
+    
+    def flood(stop_event):
+        sender = socket.socket(socket.AF_PACKET, socket.SOCK_RAW)
+        try:
+            sender.bind((interface, 0))
+            while not stop_event.is_set():
+                for _ in range(256):
+                    sender.send(frame)
+        finally:
+            sender.close()
+    
+    def run(engine):
+        if engine == "mmap":
+            capture = TPacketV3Ring(interface)
+            sock = capture.sock
+            frames = capture.frames
+        else:
+            sock = open_arp_sniffer_socket(interface)
+            capture = sock
+            frames = lambda stop: sniff_frames(sock, stop)
+        
+        stop_event = threading.Event()
+        flooder = threading.Thread(target=flood, args=(stop_event,), daemon=True)
+        packets = 0
+        pipeline = detect_arp_packets(parse_arp_packets(frames(stop_event)), ARPPacketDetector())
+        try:
+            flooder.start()
+            start_time = time.perf_counter()
+            for _ in pipeline:
+                packets += 1
+                if time.perf_counter() - start_time >= duration:
+                    break
+            elapsed = time.perf_counter() - start_time
+        finally:
+            stop_event.set()
+            pipeline.close()
+            flooder.join()
+            stats = get_packet_statistics(sock)
+            capture.close()
+        return {"pps": packets / elapsed, "packets": packets, "drops": stats["drops"]}
+    
+    results = {}
+    for engine in ("recv", "mmap"):
+        results[engine] = run(engine)
+        logger.info(f"Yakalama motoru '{engine}': {results[engine]['pps']:.0f} paket/sn, "
+                    f"{results[engine]['drops']} düşürülen")
+    return results
+
+# Arayüz bilgisi ioctl sabitleri (linux/sockios.h)
+SIOCGIFADDR = 0x8915
+SIOCGIFNETMASK = 0x891B
+SIOCGIFHWADDR = 0x8927
+
+# Aktif taramada kabul edilen en büyük alt ağ (/16)
+SWEEP_MIN_PREFIX = 16
+
+# Aktif taramada dolu gönderim kuyruğunun boşalması için beklenecek en uzun süre (saniye)
+SWEEP_SEND_TIMEOUT = 1.0
+
+def get_interface_info(interface):
+    """
+    Arayüzün IPv4 adresini, ağ maskesini ve MAC adresini ioctl ile okur.
+    
+    Args:
+        interface (str): Arayüz adı
+        
+    Returns:
+        dict: {"interface", "ip", "netmask", "mac"} (IP ve maske 32 bit tamsayı, MAC bytes)
+    """
+    import fcntl
+    
+    request = struct.pack("256s", interface.encode()[:15])
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        ip = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)[20:24]
+        netmask = fcntl.ioctl(sock.fileno(), SIOCGIFNETMASK, request)[20:24]
+        mac = fcntl.ioctl(sock.fileno(), SIOCGIFHWADDR, request)[18:24]
+    finally:
+        sock.close()
+    return {
+        "interface": interface,
+        "ip": struct.unpack("!I", ip)[0],
+        "netmask": struct.unpack("!I", netmask)[0],
+        "mac": mac,
+    }
+
+# Alt ağı aktif olarak tarama
+def arp_sweep(interface=None, rate=20000, wait=0.5):
+    """
+    Arayüzün alt ağındaki her adrese ham soketten ARP isteği gönderir ve
+    yanıtları tek bir alma döngüsünde son tarihe kadar toplar.
+    
+    Gönderim hız sınırına göre zamanlanır; gönderim önde gittiğinde beklenen
+    süre yanıt almak için kullanılır.
+    
+    Args:
+        interface (str): Taranacak arayüz; None ise varsayılan rotanın arayüzü
+        rate (int): Saniyede en fazla gönderilecek istek (None ise sınırsız)
+        wait (float): Son istekten sonra yanıtlar için beklenecek süre (saniye)
+        
+    Returns:
+        list: Yanıt veren cihazlar için {"ip", "mac", "interface"} kayıtları
+    """
+    if interface is None:
+        route = get_default_route()
+        if route is None:
+            raise OSError("Varsayılan rota bulunamadı, taranacak arayüz belirlenemiyor")
+        interface = route[1]
+    
+    info = get_interface_info(interface)
+    prefix = bin(info["netmask"]).count("1")
+    if prefix < SWEEP_MIN_PREFIX:
+        raise ValueError(f"Alt ağ çok büyük (/{prefix}), en fazla /{SWEEP_MIN_PREFIX} taranabilir")
+    network = info["ip"] & info["netmask"]
+    broadcast = network | (~info["netmask"] & 0xFFFFFFFF)
+    own_ip = struct.pack("!I", info["ip"])
+    own_ip_text = format_ip(own_ip)
+    
+    # İstek şablonu: her adres için sadece hedef IP alanı değiştirilir
+    template = bytearray(_ETH_HEADER.pack(b"\xff" * 6, info["mac"], ETH_P_ARP) +
+                         _ARP_PACKET.pack(ARPHRD_ETHER, 0x0800, 6, 4, ARPOP_REQUEST,
+                                          info["mac"], own_ip, b"\x00" * 6, b"\x00" * 4))
+    target_offset = _ETH_HEADER.size + 24
+    
+    sock = open_arp_sniffer_socket(interface, replies_only=True)
+    sock.setblocking(False)
+    responders = set()
+    buffer = bytearray(2048)
+    
+    def receive(timeout):
+        # Soket okunabilir olduğu sürece bekleyen tüm yanıtları boşalt
+        readable, _, _ = select.select([sock], [], [], max(timeout, 0))
+        while readable:
+            try:
+                nbytes = sock.recv_into(buffer)
+            except BlockingIOError:
+                break
+            packet = parse_arp_frame(memoryview(buffer)[:nbytes])
+            if packet is None or packet["target_ip"] != own_ip_text:
+                continue
+            sender = struct.unpack("!I", socket.inet_aton(packet["sender_ip"]))[0]
+            if network < sender < broadcast:
+                responders.add((packet["sender_ip"], packet["sender_mac"]))
+    
+    def send(frame):
+        # Gönderim kuyruğu dolunca (EAGAIN) yanıtları boşaltarak yazılabilir olmasını bekle
+        while True:
+            try:
+                sock.send(frame)
+                return
+            except BlockingIOError:
+                readable, writable, _ = select.select([sock], [sock], [], SWEEP_SEND_TIMEOUT)
+                if readable:
+                    receive(0)
+                elif not writable:
+                    raise OSError(f"{interface} gönderim kuyruğu {SWEEP_SEND_TIMEOUT} saniyede boşalmadı")
+    
+    try:
+        start_time = time.perf_counter()
+        sent = 0
+        for address in range(network + 1, broadcast):
+            if address == info["ip"]:
+                continue
+            struct.pack_into("!I", template, target_offset, address)
+            send(template)
+            sent += 1
+            
+            if sent % 64 == 0:
+                # Hız sınırının önündeysek aradaki süreyi yanıt almak için kullan
+                ahead = (start_time + sent / rate - time.perf_counter()) if rate else 0
+                receive(ahead)
+        
+        deadline = time.perf_counter() + wait
+        while time.perf_counter() < deadline:
+            receive(deadline - time.perf_counter())
+    finally:
+        sock.close()
+    
+    logger.info(f"Aktif tarama tamamlandı: {sent} istek, {len(responders)} yanıt "
+                f"({time.perf_counter() - start_time:.2f} sn)")
+    return [{"ip": ip, "mac": mac, "interface": interface} for ip, mac in sorted(responders)]
+
+# Taramalar arası IP-MAC eşleme takibi
+class BindingTracker:
+    """
+    IP -> MAC eşlemelerini taramalar ve komşu olayları arasında saklar.
+    
+    Her yeni tablo önceki durumla karşılaştırılır; sadece eklenen, silinen ve
+    değişen kayıtlar işlenir. Bir IP'nin MAC adresinin değişmesi klasik ARP
+    zehirlenmesi belirtisi olarak "binding_changed" bulgusu üretir. Durum
+    ARPTable ile aynı tamsayı gösteriminde tutulur.
+    """
+    def __init__(self):
+        self.bindings = {}  # (IP, arayüz indeksi) -> MAC (tamsayı)
+        self.mac_to_ips = defaultdict(set)  # MAC -> IP kümesi (artımlı tutulur)
+        self.initialized = False
+    
+    def _bind(self, key, mac):
+        """Eşlemeyi ekler"""
+        self.bindings[key] = mac
+        self.mac_to_ips[mac].add(key[0])
+    
+    def _unbind(self, key):
+        """Eşlemeyi kaldırır ve eski MAC adresini döndürür"""
+        mac = self.bindings.pop(key)
+        ips = self.mac_to_ips[mac]
+        ips.discard(key[0])
+        if not ips:
+            del self.mac_to_ips[mac]
+        return mac
+    
+    @staticmethod
+    def _key_text(key):
+        """Tamsayı anahtarı (IP, arayüz adı) biçimine çevirir"""
+        return int_to_ip(key[0]), _interface_names[key[1]]
+    
+    def _changed_finding(self, key, old_mac, new_mac):
+        """MAC değişikliği bulgusunu oluşturur"""
+        ip, interface = self._key_text(key)
+        old_mac = int_to_mac(old_mac)
+        new_mac = int_to_mac(new_mac)
+        return {
+            "type": "binding_changed",
+            "ip": ip,
+            "interface": interface,
+            "old_mac": old_mac,
+            "mac": new_mac,
+            "threat_level": "high",
+            "message": f"❌ TEHLİKE: {ip} IP adresinin MAC adresi değişti: {old_mac} -> {new_mac}"
+        }
+    
+    def update(self, arp_table):
+        """
+        Yeni bir ARP tablosunu önceki durumla karşılaştırıp durumu günceller.
+        
+        Args:
+            arp_table (ARPTable | list): ARP tablosu kayıtları
+            
+        Returns:
+            dict: {"added", "removed", "changed", "findings"}; ilk tabloda bulgu üretilmez
+        """
+        table = ARPTable.from_entries(arp_table)
+        current = dict(zip(zip(table.ips, table.interfaces), table.macs))
+        diff = {"added": [], "removed": [], "changed": [], "findings": []}
+        
+        # Farkları C seviyesinde küme işlemleriyle bul; sadece değişenleri işle
+        appeared = current.items() - self.bindings.items()
+        vanished = self.bindings.items() - current.items()
+        for key, _mac in vanished:
+            if key not in current:
+                self._unbind(key)
+                diff["removed"].append(self._key_text(key))
+        for key, mac in appeared:
+            if key in self.bindings:
+                old_mac = self._unbind(key)
+                diff["changed"].append((self._key_text(key), int_to_mac(old_mac), int_to_mac(mac)))
+                if self.initialized:
+                    diff["findings"].append(self._changed_finding(key, old_mac, mac))
+            else:
+                diff["added"].append(self._key_text(key))
+            self._bind(key, mac)
+        
+        self.initialized = True
+        return diff
+    
+    def apply_event(self, ip, interface, mac, deleted=False):
+        """
+        Tek bir komşu olayını (RTM_NEWNEIGH/RTM_DELNEIGH) O(1) maliyetle uygular.
+        
+        Args:
+            ip (str): IP adresi
+            interface (str): Arayüz adı
+            mac (str): Yeni MAC adresi (silmede kullanılmaz)
+            deleted (bool): Kayıt silindi mi
+            
+        Returns:
+            list: Tespit edilen şüpheli durumlar
+        """
+        key = (ip_to_int(ip), _intern_interface(interface))
+        if deleted or not mac:
+            if key in self.bindings:
+                self._unbind(key)
+            return []
+        
+        try:
+            mac = mac_to_int(mac)
+        except ValueError:
+            # Ethernet olmayan bağlantı adresleri (tünel vb.) takip edilmez
+            return []
+        old_mac = self.bindings.get(key)
+        if old_mac == mac:
+            return []
+        findings = []
+        if old_mac is not None:
+            self._unbind(key)
+            findings.append(self._changed_finding(key, old_mac, mac))
+        self._bind(key, mac)
+        self.initialized = True
+        return findings
+
+# Kayan pencereli hız sayacı
+class SlidingWindowCounter:
+    """
+    Anahtar başına sabit boyutlu bir halka tamponda son olay zamanlarını tutar.
+    
+    Halka eşik değeri kadar olay saklar; dolu halkanın en eski olayı pencere
+    içindeyse hız aşılmış demektir. Anahtarlar son erişim sırasıyla tutulur ve
+    boşta kalanlar (ya da en fazla anahtar sayısı aşıldığında en eskiler)
+    otomatik olarak atılır, böylece bellek kullanımı sınırlı kalır.
+    """
+    def __init__(self, window, threshold, idle_timeout=60.0, max_keys=10000):
+        self.window = window
+        self.threshold = threshold
+        self.idle_timeout = idle_timeout
+        self.max_keys = max_keys
+        self.keys = OrderedDict()  # Anahtar -> [zaman halkası, son uyarı zamanı]
+    
+    def _evict(self, now):
+        """Boşta kalan ve sınırı aşan anahtarları atar"""
+        deadline = now - self.idle_timeout
+        while self.keys:
+            times = next(iter(self.keys.values()))[0]
+            if len(self.keys) <= self.max_keys and times[-1] >= deadline:
+                break
+            self.keys.popitem(last=False)
+    
+    def hit(self, key, now):
+        """
+        Anahtar için bir olay kaydeder.
+        
+        Args:
+            key: Sayılan anahtar (MAC ya da IP)
+            now (float): Olay zamanı
+            
+        Returns:
+            int: Eşik pencere içinde aşıldıysa halkadaki olay sayısı, aksi halde 0.
+                 Aynı anahtar için bir pencere boyunca tekrar uyarı verilmez.
+        """
+        slot = self.keys.get(key)
+        if slot is None:
+            slot = [deque(maxlen=self.threshold), None]
+            self.keys[key] = slot
+        else:
+            self.keys.move_to_end(key)
+        times = slot[0]
+        times.append(now)
+        self._evict(now)
+        
+        if len(times) == self.threshold and now - times[0] <= self.window:
+            if slot[1] is None or now - slot[1] >= self.window:
+                slot[1] = now
+                return len(times)
+        return 0
+
+# ARP yanıt hızı ve gratuitous ARP fırtınası tespiti
+class ARPRateDetector:
+    """
+    Sniffer paketleri ya da komşu olaylarıyla beslenen kayan pencereli tespit.
+    
+    Zehirleme araçları sahte yanıtları bir iki saniyede bir yeniden gönderir;
+    MAC başına yanıt ve gratuitous ARP hızları ile IP başına eşleme değişim
+    (flip) sayısı pencere içinde eşikleri aşarsa tehdit üretilir.
+    """
+    def __init__(self, window=10.0, reply_threshold=20, gratuitous_threshold=10,
+                 flip_threshold=3, idle_timeout=60.0, max_keys=10000):
+        self.window = window
+        self.replies = SlidingWindowCounter(window, reply_threshold, idle_timeout, max_keys)
+        self.gratuitous = SlidingWindowCounter(window, gratuitous_threshold, idle_timeout, max_keys)
+        self.flips = SlidingWindowCounter(window, flip_threshold, idle_timeout, max_keys)
+    
+    def observe_reply(self, mac, ip, now):
+        """Bir ARP yanıtını sayar"""
+        count = self.replies.hit(mac, now)
+        if not count:
+            return []
+        return [{
+            "type": "arp_reply_flood",
+            "mac": mac,
+            "ip": ip,
+            "count": count,
+            "threat_level": "medium",
+            "message": f"⚠️ Şüpheli: {mac} son {self.window:g} saniyede {count} ARP yanıtı gönderdi (son IP: {ip})"
+        }]
+    
+    def observe_gratuitous(self, mac, ip, now):
+        """Bir gratuitous ARP paketini sayar"""
+        count = self.gratuitous.hit(mac, now)
+        if not count:
+            return []
+        return [{
+            "type": "gratuitous_arp_storm",
+            "mac": mac,
+            "ip": ip,
+            "count": count,
+            "threat_level": "high",
+            "message": f"❌ TEHLİKE: {mac} son {self.window:g} saniyede {count} gratuitous ARP gönderdi (IP: {ip})"
+        }]
+    
+    def observe_flip(self, ip, mac, now):
+        """Bir IP'nin MAC eşlemesinin değişmesini sayar"""
+        count = self.flips.hit(ip, now)
+        if not count:
+            return []
+        return [{
+            "type": "binding_flapping",
+            "ip": ip,
+            "mac": mac,
+            "count": count,
+            "threat_level": "high",
+            "message": f"❌ TEHLİKE: {ip} IP adresinin MAC eşlemesi son {self.window:g} saniyede {count} kez değişti (son MAC: {mac})"
+        }]
+
+# İstek/yanıt eşleştirmesi için zamanlama çarkı
+class RequestTimingWheel:
+    """
+    Bekleyen ARP isteklerini karma tabanlı bir zamanlama çarkında tutar.
+    
+    Çark, zaman aşımını kapsayan sabit sayıda dilimden oluşur. Ekleme, eşleme
+    ve süre dolumu O(1) maliyetlidir: zaman ilerledikçe sadece geçilen
+    dilimler boşaltılır. Kayıt sayısı max_entries ile sınırlanır; böylece
+    istek fırtınasında bile bellek büyümez.
+    """
+    def __init__(self, timeout=ARP_REQUEST_TIMEOUT, tick=0.25, max_entries=65536):
+        self.timeout = timeout
+        self.tick = tick
+        self.max_entries = max_entries
+        self.slots = [set() for _ in range(int(timeout / tick) + 2)]
+        self.pending = {}  # (istenen IP, isteyen IP) -> son kullanma zamanı
+        self.current_tick = None
+        self.dropped = 0
+    
+    def advance(self, now):
+        """Saati ilerletir ve tamamen geçmişte kalan dilimlerdeki süresi dolmuş istekleri atar"""
+        now_tick = int(now / self.tick)
+        if self.current_tick is None:
+            self.current_tick = now_tick
+            return
+        # İçinde bulunulan dilim henüz dolmamış istekler içerebilir, sadece öncekiler boşaltılır.
+        # Çarkın tamamından fazla ilerlemeye gerek yok.
+        steps = min(now_tick - self.current_tick, len(self.slots))
+        for step in range(steps):
+            index = (self.current_tick + step) % len(self.slots)
+            slot = self.slots[index]
+            survivors = []
+            for key in slot:
+                expiry = self.pending.get(key)
+                if expiry is None:
+                    continue
+                if expiry <= now:
+                    del self.pending[key]
+                elif int(expiry / self.tick) % len(self.slots) == index:
+                    # Uzun sessizlikten sonra çarkın sonraki turuna düşen istek bu dilimde kalır
+                    survivors.append(key)
+                # Yenilenmiş istekler başka bir dilimde yaşamaya devam eder
+            slot.clear()
+            slot.update(survivors)
+        self.current_tick = max(self.current_tick, now_tick)
+    
+    def add(self, requested_ip, requester_ip, now):
+        """
+        Bir isteği kaydeder (aynı istek tekrarlanırsa süresi yenilenir).
+        
+        Args:
+            requested_ip (str): Çözülmesi istenen IP
+            requester_ip (str): İsteği gönderen IP
+            now (float): İstek zamanı
+        """
+        self.advance(now)
+        key = (requested_ip, requester_ip)
+        if key not in self.pending and len(self.pending) >= self.max_entries:
+            self.dropped += 1
+            return
+        expiry = now + self.timeout
+        self.pending[key] = expiry
+        self.slots[int(expiry / self.tick) % len(self.slots)].add(key)
+    
+    def match(self, replier_ip, requester_ip, now):
+        """
+        Bir yanıtı bekleyen istekle eşleştirir ve isteği tüketir.
+        
+        Args:
+            replier_ip (str): Yanıtı gönderen (istenen) IP
+            requester_ip (str): Yanıtın hedefi (isteyen) IP
+            now (float): Yanıt zamanı
+            
+        Returns:
+            bool: Yanıt bekleyen bir isteğe karşılık geliyorsa True
+        """
+        self.advance(now)
+        expiry = self.pending.pop((replier_ip, requester_ip), None)
+        return expiry is not None and expiry > now
+    
+    def __len__(self):
+        return len(self.pending)
+
+# Durum bilgili paket tabanlı ARP spoofing tespiti
+class ARPPacketDetector:
+    """
+    Ağda görülen ARP paketlerinden IP-MAC eşlemelerini öğrenir ve
+    gratuitous, istenmemiş ve eşleme değiştiren yanıtları tespit eder.
+    
+    Öğrenilen eşlemeler son görülme sırasıyla tutulur; rastgele IP'lerle
+    yapılan bir selde bellek büyümesin diye max_bindings aşıldığında en
+    uzun süredir görülmeyenler atılır.
+    """
+    def __init__(self, request_timeout=ARP_REQUEST_TIMEOUT, track_requests=True, rate_detector=None,
+                 max_bindings=65536):
+        self.request_timeout = request_timeout
+        # Soket filtresi istekleri görmüyorsa istenmemiş yanıt kontrolü yapılamaz
+        self.track_requests = track_requests
+        self.rate_detector = rate_detector if rate_detector is not None else ARPRateDetector()
+        self.max_bindings = max_bindings
+        self.bindings = OrderedDict()  # IP -> MAC (son görülme sırasıyla)
+        self.pending_requests = RequestTimingWheel(request_timeout)  # Yanıt bekleyen istekler
+        self.packet_count = 0
+    
+    def process(self, packet):
+        """
+        Tek bir ARP paketini işler.
+        
+        Args:
+            packet (dict): parse_arp_frame çıktısı
+            
+        Returns:
+            list: Tespit edilen şüpheli durumlar
+        """
+        findings = []
+        self.packet_count += 1
+        now = packet["timestamp"]
+        
+        op = packet["op"]
+        sender_ip = packet["sender_ip"]
+        sender_mac = packet["sender_mac"]
+        gratuitous = sender_ip == packet["target_ip"]
+        
+        if op == ARPOP_REQUEST and not gratuitous and self.track_requests:
+            self.pending_requests.add(packet["target_ip"], sender_ip, now)
+        
+        # Ethernet kaynağı ile ARP gönderen MAC'i farklıysa
+        if packet["eth_src"] != sender_mac:
+            findings.append({
+                "type": "ethernet_arp_mismatch",
+                "ip": sender_ip,
+                "mac": sender_mac,
+                "eth_src": packet["eth_src"],
+                "threat_level": "medium",
+                "message": f"⚠️ Şüpheli: {sender_ip} için ARP gönderen MAC ({sender_mac}) Ethernet kaynağından ({packet['eth_src']}) farklı"
+            })
+        
+        # Yanıt ve gratuitous ARP hızlarını say
+        if gratuitous:
+            findings.extend(self.rate_detector.observe_gratuitous(sender_mac, sender_ip, now))
+        elif op == ARPOP_REPLY:
+            findings.extend(self.rate_detector.observe_reply(sender_mac, sender_ip, now))
+        
+        if gratuitous:
+            findings.append({
+                "type": "gratuitous_arp",
+                "ip": sender_ip,
+                "mac": sender_mac,
+                "threat_level": "none",
+                "message": f"📌 Bilgi: Gratuitous ARP: IP={sender_ip}, MAC={sender_mac}"
+            })
+        elif op == ARPOP_REPLY and self.track_requests:
+            if not self.pending_requests.match(sender_ip, packet["target_ip"], now):
+                findings.append({
+                    "type": "unsolicited_reply",
+                    "ip": sender_ip,
+                    "mac": sender_mac,
+                    "threat_level": "medium",
+                    "message": f"⚠️ Şüpheli: {sender_ip} için istenmemiş ARP yanıtı ({sender_mac})"
+                })
+        
+        # Öğrenilmiş eşleme değişti mi kontrol et (0.0.0.0 ARP probe'larını atla)
+        if sender_ip != "0.0.0.0" and (op == ARPOP_REPLY or gratuitous):
+            previous = self.bindings.get(sender_ip)
+            if previous is not None and previous != sender_mac:
+                findings.append({
+                    "type": "binding_changed",
+                    "ip": sender_ip,
+                    "old_mac": previous,
+                    "mac": sender_mac,
+                    "threat_level": "high",
+                    "message": f"❌ TEHLİKE: {sender_ip} IP adresinin MAC adresi değişti: {previous} -> {sender_mac}"
+                })
+                findings.extend(self.rate_detector.observe_flip(sender_ip, sender_mac, now))
+            self.bindings[sender_ip] = sender_mac
+            self.bindings.move_to_end(sender_ip)
+            if len(self.bindings) > self.max_bindings:
+                self.bindings.popitem(last=False)
+        
+        return findings
+
+# pcap/pcapng sabitleri
+PCAP_MAGIC_USEC = 0xA1B2C3D4
+PCAP_MAGIC_NSEC = 0xA1B23C4D
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_IDB = 0x00000001
+PCAPNG_SPB = 0x00000003
+PCAPNG_EPB = 0x00000006
+LINKTYPE_ETHERNET = 1
+
+def _read_pcap_classic(view, endian):
+    """Klasik pcap dosyasındaki çerçeveleri üretir"""
+    magic, _major, _minor, _zone, _sigfigs, _snaplen, linktype = struct.unpack_from(endian + "IHHiIII", view, 0)
+    if linktype != LINKTYPE_ETHERNET:
+        raise ValueError(f"Desteklenmeyen bağlantı türü: {linktype}")
+    divisor = 1e9 if magic == PCAP_MAGIC_NSEC else 1e6
+    record = struct.Struct(endian + "IIII")
+    offset = 24
+    end = len(view)
+    while offset + record.size <= end:
+        sec, frac, caplen, _origlen = record.unpack_from(view, offset)
+        offset += record.size
+        yield sec + frac / divisor, view[offset:offset + caplen]
+        offset += caplen
+
+def _read_pcapng(view):
+    """pcapng dosyasındaki çerçeveleri üretir (SHB, IDB, EPB ve SPB blokları)"""
+    endian = "<"
+    interfaces = []  # (linktype, zaman çözünürlüğü bölüm değeri)
+    offset = 0
+    end = len(view)
+    while offset + 12 <= end:
+        block_type = struct.unpack_from(endian + "I", view, offset)[0]
+        if block_type == PCAPNG_SHB:
+            # Her bölüm kendi bayt sırasını belirler
+            endian = "<" if struct.unpack_from("<I", view, offset + 8)[0] == PCAPNG_BYTE_ORDER_MAGIC else ">"
+            interfaces = []
+        block_len = struct.unpack_from(endian + "I", view, offset + 4)[0]
+        if block_len < 12:
+            raise ValueError(f"Geçersiz pcapng blok uzunluğu: {block_len}")
+        body = offset + 8
+        
+        if block_type == PCAPNG_IDB:
+            linktype = struct.unpack_from(endian + "H", view, body)[0]
+            divisor = 1e6
+            # Seçenekleri tara: if_tsresol (kod 9)
+            pos = body + 8
+            while pos + 4 <= offset + block_len - 4:
+                code, length = struct.unpack_from(endian + "HH", view, pos)
+                if code == 0:
+                    break
+                if code == 9 and length >= 1:
+                    resolution = view[pos + 4]
+                    divisor = float(2 ** (resolution & 0x7F)) if resolution & 0x80 else float(10 ** resolution)
+                pos += 4 + _nl_align(length)
+            interfaces.append((linktype, divisor))
+        elif block_type == PCAPNG_EPB:
+            if_id, ts_high, ts_low, caplen, _origlen = struct.unpack_from(endian + "IIIII", view, body)
+            linktype, divisor = interfaces[if_id]
+            if linktype == LINKTYPE_ETHERNET:
+                data = body + 20
+                yield ((ts_high << 32) | ts_low) / divisor, view[data:data + caplen]
+        elif block_type == PCAPNG_SPB:
+            if interfaces and interfaces[0][0] == LINKTYPE_ETHERNET:
+                origlen = struct.unpack_from(endian + "I", view, body)[0]
+                data = body + 4
+                caplen = min(origlen, block_len - 16)
+                yield 0.0, view[data:data + caplen]
+        
+        offset += block_len
+
+# Kayıtlı yakalama dosyasını okuma
+def read_pcap_frames(path):
+    """
+    .pcap ya da .pcapng dosyasındaki Ethernet çerçevelerini bellek eşlemesiyle okur.
+    
+    Dosya tek seferde mmap edilir ve çerçeveler kopyalanmadan memoryview
+    dilimleri olarak üretilir (sniff_frames ile aynı sözleşme, boşta None üretmez).
+    
+    Args:
+        path (str): Yakalama dosyasının yolu
+        
+    Yields:
+        tuple: (zaman damgası, çerçeve)
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                magic = struct.unpack_from("<I", view, 0)[0]
+                if magic in (PCAP_MAGIC_USEC, PCAP_MAGIC_NSEC):
+                    reader = _read_pcap_classic(view, "<")
+                elif struct.unpack_from(">I", view, 0)[0] in (PCAP_MAGIC_USEC, PCAP_MAGIC_NSEC):
+                    reader = _read_pcap_classic(view, ">")
+                elif magic == PCAPNG_SHB:
+                    reader = _read_pcapng(view)
+                else:
+                    raise ValueError(f"Tanınmayan yakalama dosyası biçimi: {path}")
+                for timestamp, frame in reader:
+                    try:
+                        yield timestamp, frame
+                    finally:
+                        frame.release()
+            finally:
+                view.release()
+
+# Kayıtlı yakalamayı tespit motorundan geçirme
+def replay_pcap(path):
+    """
+    Bir yakalama dosyasını canlı ağ ve arayüz olmadan, olabildiğince hızlı
+    şekilde ARP tespit motorundan geçirir.
+    
+    Args:
+        path (str): .pcap ya da .pcapng dosyasının yolu
+        
+    Returns:
+        dict: ARPScanner tarama sonucuyla aynı yapı ve "stats" altında verim bilgileri
+    """
+    start_time = time.time()
+    perf_start = time.perf_counter()
+    detector = ARPPacketDetector()
+    suspicious = []
+    frame_count = 0
+    byte_count = 0
+    
+    def counted(frames):
+        nonlocal frame_count, byte_count
+        for item in frames:
+            frame_count += 1
+            byte_count += len(item[1])
+            yield item
+    
+    for findings in detect_arp_packets(parse_arp_packets(counted(read_pcap_frames(path))), detector):
+        suspicious.extend(findings)
+    
+    # Öğrenilen eşlemelerden ARP tablosu oluştur ve tablo tabanlı kontrolleri uygula
+    arp_table = [{"ip": ip, "mac": mac, "interface": "pcap"} for ip, mac in detector.bindings.items()]
+    gateway = {"ip": "Bilinmiyor", "mac": "Bilinmiyor"}  # Yerel sistemin ağ geçidi kayıtla ilgisiz
+    suspicious.extend(detect_arp_spoofing(arp_table, gateway))
+    
+    elapsed = time.perf_counter() - perf_start
+    return {
+        "timestamp": start_time,
+        "arp_table": arp_table,
+        "gateway": gateway,
+        "suspicious_entries": suspicious,
+        "threat_level": get_threat_level(suspicious),
+        "duration": elapsed,
+        "stats": {
+            "frames": frame_count,
+            "arp_packets": detector.packet_count,
+            "bytes": byte_count,
+            "pps": frame_count / elapsed if elapsed > 0 else 0.0,
+        },
+    }
+
+# Gateway MAC taban çizgisi dosyası
+GATEWAY_BASELINE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "gateway_baseline.json")
 
-# ARP tablosunu alma
-def get_arp_table():
+# Ağ başına öğrenilmiş gateway MAC adresi
+class GatewayBaseline:
     """
-    Sistemin ARP tablosunu alır.
+    Her ağ için (gateway IP, arayüz) öğrenilen gateway MAC adresini diskte saklar.
     
-    Returns:
-        list: ARP tablosundaki kayıtlar listesi
+    İlk görülen MAC taban çizgisi olarak kaydedilir ve uygulama yeniden
+    başlasa da korunur. Sonraki her tarama/komşu olayı sözlük üzerinden O(1)
+    karşılaştırılır; MAC farklıysa yüksek seviyeli bulgu üretilir. Saldırganın
+    MAC'i öğrenilmesin diye taban çizgisi kendiliğinden güncellenmez; meşru
+    değişiklikten (ör. router değişimi) sonra yeni MAC accept() ile onaylanır
+    ya da reset() ile yeniden öğretilir.
     """
-    arp_entries = []
+    def __init__(self, path=GATEWAY_BASELINE_FILE):
+        self.path = path
+        self.baselines = {}  # (gateway IP, arayüz) -> {"mac", "learned_at"}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger("V-ARP.GatewayBaseline")
+        self._load()
     
-    try:
-        # Platforma göre uygun komutu belirle
-        if os.name == 'nt':  # Windows
-            # Windows'ta arp komutunu çalıştır
-            output = subprocess.check_output(['arp', '-a'], text=True)
-            # Windows ARP çıktısını ayrıştır
-            pattern = r'(\d+\.\d+\.\d+\.\d+)\s+([0-9a-f-]+)\s+(\w+)'
-            for line in output.split('\n'):
-                match = re.search(pattern, line)
-                if match:
-                    ip, mac, interface_type = match.groups()
-                    mac = mac.replace('-', ':')  # Standart formata çevir
-                    arp_entries.append({"ip": ip, "mac": mac, "interface": interface_type})
-        else:  # Linux/Unix
-            # Linux'ta arp komutunu çalıştır
-            output = subprocess.check_output(['arp', '-n'], text=True)
-            # Linux ARP çıktısını ayrıştır
-            for line in output.split('\n')[1:]:  # Başlık satırını atla
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        ip = parts[0]
-                        mac = parts[2]
-                        interface = parts[-1] if len(parts) > 3 else "unknown"
-                        if mac != "(incomplete)":  # Eksik kayıtları atla
-                            arp_entries.append({"ip": ip, "mac": mac, "interface": interface})
-        
-        logger.debug(f"ARP tablosu alındı: {len(arp_entries)} kayıt")
-        return arp_entries
+    @staticmethod
+    def _file_key(key):
+        """Sözlük anahtarını JSON anahtarına çevirir"""
+        return f"{key[0]}|{key[1] or ''}"
+    
+    def _load(self):
+        """Kayıtlı taban çizgilerini yükler"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for file_key, baseline in data.items():
+                    ip, _, interface = file_key.partition("|")
+                    self.baselines[(ip, interface or None)] = baseline
+                self.logger.info(f"Gateway taban çizgileri yüklendi: {len(self.baselines)} ağ")
+        except Exception as e:
+            self.logger.error(f"Gateway taban çizgileri yüklenirken hata: {e}")
+    
+    def _save(self):
+        """Taban çizgilerini diske yazar (yarım dosya kalmasın diye geçici dosya ile)"""
+        try:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({self._file_key(key): baseline for key, baseline in self.baselines.items()},
+                          f, indent=4)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Gateway taban çizgileri kaydedilirken hata: {e}")
+    
+    def check(self, gateway, now=None):
+        """
+        Gateway MAC adresini taban çizgisiyle karşılaştırır, yoksa öğrenir.
         
-    except Exception as e:
-        logger.error(f"ARP tablosu alınırken hata oluştu: {e}")
-        logger.warning("Test verileri kullanılıyor.")
-        
-        # Normal ve şüpheli durumları içeren test verileri oluştur
-        test_entries = [
-            {"ip": "192.168.1.1", "mac": "aa:bb:cc:dd:ee:ff", "interface": "eth0"},  # Ağ geçidi
-            {"ip": "192.168.1.2", "mac": "11:22:33:44:55:66", "interface": "eth0"},  # Normal cihaz
-            {"ip": "192.168.1.3", "mac": "aa:bb:cc:dd:ee:ff", "interface": "eth0"},  # Şüpheli (ağ geçidi MAC'i ile aynı)
-            {"ip": "192.168.1.4", "mac": "22:33:44:55:66:77", "interface": "eth0"},  # Normal cihaz
-            {"ip": "192.168.1.5", "mac": "33:22:55:66:77:88", "interface": "eth0"},  # Normal cihaz 
-            {"ip": "192.168.1.6", "mac": "aa:bb:cc:11:22:33", "interface": "eth0"},  # Normal cihaz
-            {"ip": "192.168.1.7", "mac": "aa:bb:cc:11:22:33", "interface": "eth0"},  # Normal IP eşlemesi (aynı cihazın 2 IP'si)
-            {"ip": "192.168.1.8", "mac": "ff:ff:ff:ff:ff:ff", "interface": "eth0"},  # Broadcast MAC
-            {"ip": "192.168.1.10", "mac": "11:22:33:44:55:66", "interface": "eth0"}, # IP çakışması (aynı MAC farklı IP)
-            {"ip": "192.168.1.100", "mac": "de:ad:be:ef:12:34", "interface": "eth0"} # Normal cihaz
-        ]
-        
-        return test_entries
+        Args:
+            gateway (dict): get_default_gateway() sonucu
+            now (float): Tarama zamanı
+            
+        Returns:
+            dict: MAC taban çizgisinden farklıysa yüksek seviyeli bulgu, değilse None
+        """
+        ip = gateway.get("ip", "Bilinmiyor")
+        mac = gateway.get("mac", "Bilinmiyor")
+        if ip == "Bilinmiyor" or mac == "Bilinmiyor":
+            return None
+        mac = mac.lower()
+        key = (ip, gateway.get("interface"))
+        
+        with self.lock:
+            baseline = self.baselines.get(key)
+            if baseline is None:
+                self.baselines[key] = {"mac": mac, "learned_at": now if now is not None else time.time()}
+                self._save()
+                self.logger.info(f"Gateway taban çizgisi öğrenildi: {ip} ({key[1]}) -> {mac}")
+                return None
+        
+        if baseline["mac"] == mac:
+            return None
+        return {
+            "type": "gateway_baseline_changed",
+            "ip": ip,
+            "interface": key[1],
+            "old_mac": baseline["mac"],
+            "mac": mac,
+            "threat_level": "high",
+            "message": f"❌ TEHLİKE: Ağ geçidi {ip} MAC adresi öğrenilen değerden farklı: {baseline['mac']} -> {mac}"
+        }
+    
+    def reset(self, ip, interface=None):
+        """Bir ağın taban çizgisini siler; sonraki taramada yeniden öğrenilir"""
+        with self.lock:
+            if self.baselines.pop((ip, interface), None) is not None:
+                self._save()
+    
+    def accept(self, ip, interface, mac, now=None):
+        """
+        Kullanıcının onayladığı yeni gateway MAC adresini taban çizgisi yapar.
+        
+        Args:
+            ip (str): Gateway IP adresi
+            interface (str): Arayüz adı
+            mac (str): Onaylanan MAC adresi
+        """
+        with self.lock:
+            self.baselines[(ip, interface)] = {"mac": mac.lower(),
+                                               "learned_at": now if now is not None else time.time()}
+            self._save()
+        self.logger.info(f"Gateway taban çizgisi güncellendi: {ip} ({interface}) -> {mac.lower()}")
 
-# Varsayılan ağ geçidini bulma
-def get_default_gateway():
+# Tekrarlanan bulguları olaylarda (incident) birleştirme
+class IncidentTracker:
     """
-    Varsayılan ağ geçidini (default gateway) bulur.
+    Taramalar boyunca tekrarlanan bulguları tek bir olayda birleştirir.
     
-    Returns:
-        dict: Ağ geçidi IP ve MAC adresi
+    Bulgular (tür, MAC kümesi, IP kümesi) anahtarıyla gruplanır. Her olay ilk
+    ve son görülme zamanı ile tekrar sayısını tutar. update() sadece durum
+    geçişlerini döndürür: "open" (yeni olay), "update" (süren olay tekrar
+    görüldü) ve "close" (olay sona erdi). Seviyesi orta seviyeden yükseğe
+    çıkan olayların "update" geçişinde "escalated" True olur. Böylece arayüz
+    ve bildirimler bulgu × tarama yerine olay sayısı kadar iş yapar.
+    
+    Tablodan türetilen bulgular, onları içermeyen ilk taramada kapanır. Paket ve
+    komşu olaylarından gelen bulgular tabloda tekrar görünmez; bunlar
+    event_close_after saniye boyunca tekrarlanmazsa kapanır.
     """
-    try:
-        if sys.platform == 'win32':
-            # Windows üzerinde çalışılıyorsa
-            result = subprocess.check_output('ipconfig', encoding='cp1254', errors='replace')
-            lines = result.splitlines()
-            gateway_ip = None
-            
-            for i, line in enumerate(lines):
-                if "Varsayılan Ağ Geçidi" in line or "Default Gateway" in line:
-                    # Türkçe veya İngilizce arayüzler için kontrol
-                    parts = line.split(":")
-                    if len(parts) > 1:
-                        gateway_ip = parts[1].strip()
-                        break
+    def __init__(self, event_close_after=300.0):
+        self.event_close_after = event_close_after
+        self.incidents = {}  # Anahtar -> açık olay
+        self._next_id = 1
+    
+    @staticmethod
+    def incident_key(finding):
+        """Bulgunun olay anahtarını döndürür"""
+        macs = set(finding.get("macs", ()))
+        if "mac" in finding:
+            macs.add(finding["mac"])
+        ips = set(finding.get("ips", ()))
+        if "ip" in finding:
+            ips.add(finding["ip"])
+        return (finding.get("type"),
+                frozenset(mac.lower() for mac in macs),
+                frozenset(ips))
+    
+    def update(self, table_findings, event_findings=(), now=None):
+        """
+        Bir taramanın bulgularını açık olaylarla birleştirir.
+        
+        Args:
+            table_findings (list): Tablonun tamamından türetilen bulgular
+            event_findings (list): Paket/komşu olaylarından gelen bulgular
+            now (float): Tarama zamanı
             
-            if gateway_ip:
-                # Gateway IP bulundu, şimdi MAC adresini bulalım
-                try:
-                    arp_result = subprocess.check_output(f'arp -a {gateway_ip}', encoding='cp1254', errors='replace', shell=True)
-                    arp_lines = arp_result.splitlines()
-                    
-                    for line in arp_lines:
-                        if gateway_ip in line:
-                            # MAC adresi genellikle ikinci sütundadır
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                gateway_mac = parts[1].replace('-', ':')
-                                logger.debug(f"Gateway bulundu: IP={gateway_ip}, MAC={gateway_mac}")
-                                return {"ip": gateway_ip, "mac": gateway_mac}
-                except Exception as e:
-                    logger.error(f"ARP tablosunda gateway MAC adresi aranırken hata: {e}")
-                    
-                # MAC bulunamadıysa sadece IP ile devam et
-                logger.warning(f"Gateway MAC adresi bulunamadı, sadece IP kullanılıyor: {gateway_ip}")
-                return {"ip": gateway_ip, "mac": "Bilinmiyor"}
-            else:
-                logger.warning("Gateway IP adresi bulunamadı")
-                return {"ip": "Bilinmiyor", "mac": "Bilinmiyor"}
-        else:
-            # Linux üzerinde çalışılıyorsa
-            try:
-                result = subprocess.check_output('ip route show default', shell=True, encoding='utf-8')
-                gateway_ip = result.split('default via ')[1].split(' ')[0]
+        Returns:
+            list: {"transition": "open"|"update"|"close", "incident": dict} geçişleri
+        """
+        if now is None:
+            now = time.time()
+        transitions = []
+        seen = {}  # Bu taramada görülen anahtar -> tablodan mı geldi
+        
+        for from_table, findings in ((True, table_findings), (False, event_findings)):
+            for finding in findings:
+                # Bilgi amaçlı kayıtlar olay açmaz
+                if finding.get("threat_level") not in ("high", "medium"):
+                    continue
+                key = self.incident_key(finding)
+                incident = self.incidents.get(key)
+                if incident is None:
+                    incident = {
+                        "id": self._next_id,
+                        "type": finding.get("type"),
+                        "state": "open",
+                        "threat_level": finding["threat_level"],
+                        "first_seen": now,
+                        "last_seen": now,
+                        "count": 0,
+                        "from_table": from_table,
+                        "finding": finding,
+                    }
+                    self._next_id += 1
+                    self.incidents[key] = incident
+                    transition = "open"
+                elif key in seen:
+                    transition = None
+                else:
+                    transition = "update"
                 
-                # MAC adresini bul
-                result = subprocess.check_output(f'ip neigh show {gateway_ip}', shell=True, encoding='utf-8')
-                gateway_mac = result.split('lladdr ')[1].split(' ')[0]
+                # Aynı taramada tekrarlanan bulgu sayacı bir kez artırır
+                if key not in seen:
+                    incident["count"] += 1
+                    incident["last_seen"] = now
+                escalated = finding["threat_level"] == "high" and incident["threat_level"] != "high"
+                if escalated:
+                    incident["threat_level"] = "high"
+                incident["finding"] = finding
+                incident["from_table"] = incident["from_table"] or from_table
+                seen[key] = seen.get(key, False) or from_table
                 
-                logger.debug(f"Gateway bulundu: IP={gateway_ip}, MAC={gateway_mac}")
-                return {"ip": gateway_ip, "mac": gateway_mac}
-            except Exception as e:
-                logger.error(f"Linux'ta gateway bilgisi alınırken hata: {e}")
-                return {"ip": "Bilinmiyor", "mac": "Bilinmiyor"}
-            
-    except Exception as e:
-        logger.error(f"Varsayılan ağ geçidi bulunurken hata oluştu: {e}")
+                if transition is not None:
+                    transitions.append({"transition": transition, "incident": dict(incident),
+                                        "escalated": escalated and transition == "update"})
+        
+        # Sona eren olayları kapat
+        for key, incident in list(self.incidents.items()):
+            if key in seen:
+                continue
+            if incident["from_table"] or now - incident["last_seen"] >= self.event_close_after:
+                del self.incidents[key]
+                incident["state"] = "closed"
+                incident["closed_at"] = now
+                transitions.append({"transition": "close", "incident": incident})
         
-    # Hata durumunda test verisi dön
-    logger.warning("Test ağ geçidi verisi kullanılıyor.")
-    return {"ip": "192.168.1.1", "mac": "aa:bb:cc:dd:ee:ff"}
+        return transitions
+    
+    def open_incidents(self):
+        """Açık olayları ilk görülme sırasıyla döndürür"""
+        return sorted((dict(incident) for incident in self.incidents.values()),
+                      key=lambda incident: incident["first_seen"])
 
-# ARP spoofing tespiti
-def detect_arp_spoofing(arp_table):
+# Tehdit seviyesi ve tablo değişimine göre uyarlanan tarama aralığı
+class AdaptiveCadence:
     """
-    ARP tablosunu inceleyerek olası ARP spoofing saldırılarını tespit eder.
+    Periyodik tarama aralığını son sonuçlara göre ayarlar.
     
-    Args:
-        arp_table (list): ARP tablosu kayıtları
-        
-    Returns:
-        list: Tespit edilen şüpheli durumlar
+    Yeni bir olay açıldığında, bir olayın seviyesi yükseldiğinde ya da tabloda
+    churn_threshold kadar değişiklik görüldüğünde aralık hemen taban değere
+    (floor) iner. Süren (yeni olmayan) tehditler aralığı sıkı tutmaz; ortam
+    sakinleştikçe aralık her taramada backoff katıyla büyüyerek normal aralığa
+    döner; tavan değeri (ceiling) hiçbir zaman aşılmaz.
     """
-    suspicious_entries = []
-    mac_to_ips = defaultdict(list)
+    def __init__(self, base_interval, floor=5.0, ceiling=None, backoff=2.0, churn_threshold=5):
+        self.base_interval = base_interval
+        self.floor = floor
+        self.ceiling = ceiling
+        self.backoff = backoff
+        self.churn_threshold = churn_threshold
+        self.interval = self._target()
+    
+    def _target(self):
+        """Sakin durumdaki aralık (normal aralık, tavanla sınırlı)"""
+        if self.ceiling is None:
+            return self.base_interval
+        return min(self.base_interval, self.ceiling)
     
-    # Her MAC adresine bağlı IP'leri topla
-    for entry in arp_table:
-        mac = entry["mac"].lower()  # Büyük/küçük harf duyarlılığını kaldır
-        ip = entry["ip"]
+    def reset(self, base_interval=None):
+        """Normal aralığı değiştirir ve uyarlamayı sıfırlar"""
+        if base_interval is not None:
+            self.base_interval = base_interval
+        self.interval = self._target()
+        return self.interval
+    
+    def should_tighten(self, result, churn=0):
+        """Yeni/yükselen olay ya da tablo değişimi aralığın taban değere inmesini gerektiriyor mu"""
+        if churn >= self.churn_threshold:
+            return True
+        return any(transition["transition"] == "open" or transition.get("escalated")
+                   for transition in result.get("incidents", ()))
+    
+    def update(self, result, churn=0):
+        """
+        Bir tarama sonucuna göre yeni aralığı hesaplar.
         
-        # Broadcast MAC adresini atla (normal bir ağ özelliği, saldırı değil)
-        if mac == "ff:ff:ff:ff:ff:ff":
-            continue
-            
-        # Multicast MAC adresini atla (normal bir ağ özelliği, saldırı değil)
-        if mac.startswith(("01:", "03:", "05:", "07:", "09:", "0b:", "0d:", "0f:")):
-            continue
+        Args:
+            result (dict): Tarama sonucu
+            churn (int): Son taramadan beri tabloda görülen değişiklik sayısı
             
-        mac_to_ips[mac].append(ip)
+        Returns:
+            float: Etkin tarama aralığı (saniye)
+        """
+        target = self._target()
+        if self.should_tighten(result, churn):
+            self.interval = min(self.floor, target)
+        else:
+            self.interval = min(self.interval * self.backoff, target)
+        return self.interval
+
+# Saniye çözünürlüklü, olay tabanlı zamanlayıcı
+class ScanScheduler:
+    """
+    Periyodik işleri bir son tarih yığını (heap) üzerinden çalıştırır.
     
-    # Bir MAC'in birden fazla IP'si varsa (1'den çok cihaz olabilir)
-    for mac, ips in mac_to_ips.items():
-        if len(ips) > 1:
-            suspicious_entries.append({
-                "type": "multiple_ips",
-                "mac": mac,
-                "ips": ips,
-                "threat_level": "medium",
-                "message": f"⚠️ Şüpheli: {mac} MAC adresine sahip {len(ips)} farklı IP adresi var: {', '.join(ips)}"
-            })
+    Tek bir thread en yakın son tarihe kadar bir koşul değişkeni üzerinde
+    bekler; yeni iş eklemek, aralık değiştirmek ya da durdurmak bekleyen
+    thread'i anında uyandırır. Aralıklar saniye cinsindendir ve isteğe bağlı
+    rastgele sapma (jitter) eklenir. Son tarihler kaymasın diye bir sonraki
+    çalıştırma planlanan zamana göre hesaplanır; geç kalınan çalıştırmalar
+    toplu yapılmaz, "missed" olarak sayılır. Her iş için gecikme (lag) ve
+    kaçırılan çalıştırma sayıları stats() ile raporlanır.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.heap = []  # (son tarih, sıra no, iş adı)
+        self.jobs = {}  # İş adı -> iş bilgisi
+        self.thread = None
+        self.running = False
+        self._sequence = itertools.count()
+        self.logger = logging.getLogger("V-ARP.ScanScheduler")
     
-    # Ağ geçidinin MAC adresi değişmiş mi kontrol et
-    gateway = get_default_gateway()
-    if gateway["ip"] != "Bilinmiyor" and gateway["mac"] != "Bilinmiyor":
-        gateway_entries = [entry for entry in arp_table if entry["ip"] == gateway["ip"]]
-        if len(gateway_entries) > 0:
-            if len(gateway_entries) > 1:
-                suspicious_entries.append({
-                    "type": "gateway_multiple_macs",
-                    "ip": gateway["ip"],
-                    "macs": [entry["mac"] for entry in gateway_entries],
-                    "threat_level": "high",
-                    "message": f"❌ TEHLİKE: Ağ geçidi {gateway['ip']} için birden fazla MAC adresi var!"
-                })
+    def _push(self, job, deadline):
+        """İşin bir sonraki son tarihini yığına ekler (eski kayıtlar geçersiz kalır)"""
+        job["seq"] = next(self._sequence)
+        job["deadline"] = deadline
+        heapq.heappush(self.heap, (deadline, job["seq"], job["name"]))
+        self.condition.notify()
     
-    # Bilgi amaçlı özel MAC adreslerini ekle (saldırı değil)
-    info_entries = []
-    for entry in arp_table:
-        mac = entry["mac"].lower()
-        # Broadcast MAC (ff:ff:ff:ff:ff:ff)
-        if mac == "ff:ff:ff:ff:ff:ff":
-            info_entries.append({
-                "type": "info_broadcast",
-                "ip": entry["ip"],
-                "mac": mac,
-                "threat_level": "none",
-                "message": f"📌 Bilgi: Broadcast MAC adresi: IP={entry['ip']}, MAC={mac}"
-            })
-        # Multicast MAC (ilk byte'ın en düşük biti 1)
-        elif mac.startswith(("01:", "03:", "05:", "07:", "09:", "0b:", "0d:", "0f:")):
-            info_entries.append({
-                "type": "info_multicast",
-                "ip": entry["ip"],
-                "mac": mac,
-                "threat_level": "none",
-                "message": f"📌 Bilgi: Multicast MAC adresi: IP={entry['ip']}, MAC={mac}"
-            })
+    def _jitter(self, job):
+        """Aralığın jitter oranı kadar rastgele sapmasını döndürür"""
+        if not job["jitter"]:
+            return 0.0
+        return random.uniform(-job["jitter"], job["jitter"]) * job["interval"]
+    
+    def schedule(self, name, func, interval, jitter=0.0, first_delay=0.0):
+        """
+        Periyodik bir iş ekler (aynı adlı iş varsa değiştirilir).
+        
+        Args:
+            name (str): İş adı
+            func (callable): Çalıştırılacak fonksiyon
+            interval (float): Çalıştırma aralığı (saniye)
+            jitter (float): Aralığa eklenecek en fazla rastgele sapma oranı (0.1 = %10)
+            first_delay (float): İlk çalıştırmadan önce beklenecek süre (saniye)
+        """
+        with self.condition:
+            now = time.monotonic()
+            job = {
+                "name": name,
+                "func": func,
+                "interval": float(interval),
+                "jitter": jitter,
+                "planned": now + first_delay,  # Jitter eklenmemiş planlanan zaman
+                "runs": 0,
+                "missed": 0,
+                "last_lag": 0.0,
+                "max_lag": 0.0,
+                "last_run": None,
+            }
+            self.jobs[name] = job
+            self._push(job, job["planned"])
+    
+    def reschedule(self, name, interval=None, delay=None):
+        """
+        Bir işin aralığını ve/veya bir sonraki çalıştırma zamanını değiştirir.
+        
+        Args:
+            name (str): İş adı
+            interval (float): Yeni aralık (saniye); None ise değişmez
+            delay (float): Bir sonraki çalıştırmaya kalan süre; None ise yeni
+                aralık son çalıştırmadan itibaren uygulanır
+        """
+        with self.condition:
+            job = self.jobs.get(name)
+            if job is None:
+                return False
+            if interval is not None:
+                job["interval"] = float(interval)
+            now = time.monotonic()
+            if delay is not None:
+                job["planned"] = now + delay
+            elif job["last_run"] is not None:
+                job["planned"] = max(now, job["last_run"] + job["interval"])
+            self._push(job, job["planned"] + self._jitter(job))
+            return True
+    
+    def cancel(self, name):
+        """İşi kaldırır"""
+        with self.condition:
+            # Yığındaki kayıtları sıra numarası eşleşmediği için atlanır
+            return self.jobs.pop(name, None) is not None
+    
+    def stats(self, name):
+        """
+        İşin zamanlama istatistiklerini döndürür.
+        
+        Returns:
+            dict: interval, runs, missed, last_lag, max_lag, next_run_in (saniye)
+        """
+        with self.condition:
+            job = self.jobs.get(name)
+            if job is None:
+                return None
+            return {
+                "interval": job["interval"],
+                "runs": job["runs"],
+                "missed": job["missed"],
+                "last_lag": job["last_lag"],
+                "max_lag": job["max_lag"],
+                "next_run_in": max(0.0, job["deadline"] - time.monotonic()),
+            }
+    
+    def start(self):
+        """Zamanlayıcı thread'ini başlatır"""
+        with self.condition:
+            if self.running:
+                return False
+            self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=False)
+        self.thread.start()
+        return True
+    
+    def stop(self, timeout=2.0):
+        """Zamanlayıcıyı durdurur; bekleyen thread hemen uyanır"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+        return not (self.thread and self.thread.is_alive())
     
-    # Bilgi amaçlı girdileri listeye ekle (şüpheli durumlar listesinin sonuna)
-    for entry in info_entries:
-        suspicious_entries.append(entry)
+    def _next_due(self):
+        """Zamanı gelen işi döndürür; yoksa en yakın son tarihe kadar bekler"""
+        with self.condition:
+            while self.running:
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                deadline, seq, name = self.heap[0]
+                job = self.jobs.get(name)
+                if job is None or job["seq"] != seq:
+                    # İptal edilmiş ya da yeniden planlanmış işin eski kaydı
+                    heapq.heappop(self.heap)
+                    continue
+                now = time.monotonic()
+                if deadline > now:
+                    self.condition.wait(deadline - now)
+                    continue
+                heapq.heappop(self.heap)
+                
+                # Gecikmeyi ve kaçırılan çalıştırmaları hesapla
+                lag = now - deadline
+                job["runs"] += 1
+                job["last_lag"] = lag
+                job["max_lag"] = max(job["max_lag"], lag)
+                job["last_run"] = now
+                planned = job["planned"] + job["interval"]
+                if planned <= now:
+                    missed = int((now - planned) // job["interval"]) + 1
+                    job["missed"] += missed
+                    planned += missed * job["interval"]
+                    self.logger.warning(f"'{name}' işi {lag:.1f} saniye gecikti, {missed} çalıştırma kaçırıldı")
+                job["planned"] = planned
+                self._push(job, planned + self._jitter(job))
+                return job
+            return None
     
-    return suspicious_entries
+    def _run(self):
+        """Zamanı gelen işleri çalıştıran thread"""
+        while True:
+            job = self._next_due()
+            if job is None:
+                break
+            try:
+                job["func"]()
+            except Exception as e:
+                self.logger.error(f"Zamanlanmış iş '{job['name']}' çalıştırılırken hata: {e}")
+                import traceback
+                traceback.print_exc()
 
 class ARPScanner:
-    def __init__(self, callback=None):
+    def __init__(self, callback=None, error_callback=None):
         self.callback = callback
+        self.error_callback = error_callback  # Tarama başarısız olduğunda hata ile çağrılır
         self.running = False
-        self.scan_thread = None
+        self.scan_future = None  # Çalışan taramanın sonucu
+        self.pending_scan = None  # Tarama sürerken gelen isteklerin birleştiği takip taraması [Future, sweep]
+        self.scan_lock = threading.Lock()
+        # Taramalar tek bir kalıcı işçi thread'inde sırayla çalışır (ilk taramada oluşturulur)
+        self.scan_executor = None
         self.periodic_running = False
         self.periodic_thread = None
+        self.monitor_running = False
+        self.monitor_thread = None
+        self.monitor_stop_event = threading.Event()  # İzleme modunu durdurma sinyali
+        self.sniffer_running = False
+        self.sniffer_thread = None
+        self.sniffer_stop_event = threading.Event()  # Paket izlemeyi durdurma sinyali
+        self.packet_detector = None
+        self.capture_stats = {"packets": 0, "drops": 0}  # Çekirdek yakalama sayaçları (kümülatif)
         
         # Loglama
         self.logger = logging.getLogger("V-ARP.ARPScanner")
@@ -267,9 +2867,36 @@ class ARPScanner:
             self.logger.error(f"Ayarlar yüklenirken hata, varsayılan değer kullanılıyor: {e}")
             self.scan_interval = 24  # saat
         
+        self.binding_tracker = BindingTracker()  # Taramalar arası IP-MAC eşlemeleri
+        self.trusted_bindings = TrustedBindings()  # Güvenilir IP-MAC eşlemeleri (dosyadan)
+        self.rule_engine = RuleEngine(trusted_bindings=self.trusted_bindings)  # Tablo tabanlı tespit kuralları
+        self.rate_detector = ARPRateDetector()  # Paket ve komşu olayı hız eşikleri
+        self.sweep_rate = 20000  # Aktif taramada saniyedeki en fazla ARP isteği
+        self.scheduler = None  # Periyodik taramaların zamanlayıcısı (ilk periyodik taramada oluşturulur)
+        self.periodic_interval = self.scan_interval * 3600  # Periyodik tarama aralığı (saniye)
+        self.scan_jitter = 0.1  # Periyodik aralığa eklenen rastgele sapma oranı
+        self.periodic_coalesced = 0  # Önceki tarama sürerken takip taramasına birleşen periyodik istekler
+        self.table_churn = 0  # Son taramadan beri tabloda görülen değişiklikler
+        
+        # Uyarlanabilir tarama aralığının taban/tavan değerleri (saniye)
+        try:
+            from modules.settings import get_setting
+            floor = get_setting("adaptive_scan_floor", 5)
+            ceiling = get_setting("adaptive_scan_ceiling", None)
+        except Exception as e:
+            self.logger.error(f"Uyarlanabilir tarama ayarları yüklenirken hata: {e}")
+            floor, ceiling = 5, None
+        self.cadence = AdaptiveCadence(self.periodic_interval, floor=floor, ceiling=ceiling)
+        self.detection_cache = None  # Son tespitin (özet, bulgular) bilgisi; history_lock ile korunur
+        self.incident_tracker = IncidentTracker()  # Taramalar arası tekrarlanan bulgular
+        self.gateway_baseline = GatewayBaseline()  # Ağ başına öğrenilen gateway MAC'i (diskte)
+        self.gateway_vendors = {}  # (Gateway IP, arayüz) -> son görülen MAC üreticisi
         self.scan_history = []  # Tarama geçmişi
+        self.history_lock = threading.Lock()  # Tarama ve izleme thread'leri geçmişi paylaşır
         self.stop_event = threading.Event()  # Durdurma sinyali için
         
+        # ARP tablosu kaynağı ilk taramada (işçi thread'inde) seçilir; kurucu bloklanmaz
+        
         # Önceki oturumdan periyodik tarama durumunu yüklemeyi dene
         try:
             from modules.settings import get_setting
@@ -278,26 +2905,48 @@ class ARPScanner:
         except Exception as e:
             self.logger.error(f"Periyodik tarama durumu yüklenirken hata: {e}")
     
-    def start_scan(self):
-        """Tek seferlik tarama başlatır"""
-        if self.running:
-            self.logger.warning("Tarama zaten çalışıyor")
-            return False
+    def start_scan(self, sweep=False):
+        """
+        Tek seferlik tarama ister.
         
-        self.running = True
-        self.stop_event.clear()  # Durdurma sinyalini temizle
+        Tarama sürerken gelen istekler kaybolmaz; hepsi mevcut tarama bittikten
+        sonra çalışacak tek bir takip taramasında birleştirilir.
         
-        # Tarama işlemini ayrı bir thread'de başlat
-        # daemon=False olarak ayarla ki uygulama kapanırken thread'i öldürmesin
-        # böylece tarama sağlıklı şekilde tamamlanabilir
-        self.scan_thread = threading.Thread(target=self._scan_thread, daemon=False)
-        self.scan_thread.start()
+        Args:
+            sweep (bool): Tablo okunmadan önce alt ağı aktif ARP istekleriyle tara
+            
+        Returns:
+            Future: Bu isteği karşılayacak taramanın sonucu
+        """
+        with self.scan_lock:
+            if self.running:
+                if self.pending_scan is None:
+                    self.pending_scan = [Future(), sweep]
+                    self.logger.info("Tarama sürüyor, istek takip taramasına eklendi")
+                else:
+                    # Birleşen isteklerden biri aktif tarama istediyse takip taraması da yapar
+                    self.pending_scan[1] = self.pending_scan[1] or sweep
+                return self.pending_scan[0]
+            
+            self.running = True
+            self.stop_event.clear()  # Durdurma sinyalini temizle
+            future = Future()
+            self.scan_future = future
+            if self.scan_executor is None:
+                self.scan_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="V-ARP-scan")
+            self.scan_executor.submit(self._scan_worker, future, sweep)
         
         self.logger.info("Tarama başlatıldı")
-        return True
+        return future
     
-    def start_periodic_scan(self, interval_hours=None):
-        """Periyodik tarama başlatır"""
+    def start_periodic_scan(self, interval_hours=None, interval_seconds=None):
+        """
+        Periyodik tarama başlatır.
+        
+        Args:
+            interval_hours (float): Tarama aralığı (saat); ayarlara kaydedilir
+            interval_seconds (float): Saniye cinsinden aralık (kaydedilmez, saat değerini geçersiz kılar)
+        """
         if interval_hours is not None:
             self.scan_interval = interval_hours
             
@@ -309,8 +2958,13 @@ class ARPScanner:
             except Exception as e:
                 self.logger.error(f"Tarama aralığı kaydedilirken hata: {e}")
         
+        self.periodic_interval = interval_seconds if interval_seconds is not None else self.scan_interval * 3600
+        effective_interval = self.cadence.reset(self.periodic_interval)
+        
         if self.periodic_running:
-            self.logger.warning("Periyodik tarama zaten çalışıyor")
+            # Çalışan zamanlayıcıya yeni aralığı hemen uygula
+            self.scheduler.reschedule("periodic", interval=effective_interval)
+            self.logger.warning(f"Periyodik tarama zaten çalışıyor, aralık güncellendi: {self.periodic_interval} saniye")
             return False
         
         self.periodic_running = True
@@ -324,12 +2978,17 @@ class ARPScanner:
         except Exception as e:
             self.logger.error(f"Periyodik tarama durumu kaydedilirken hata: {e}")
         
-        # Periyodik taramayı ayrı bir thread'de başlat
-        # daemon=False olarak ayarla ki uygulama kapanırken thread'i öldürmesin
-        self.periodic_thread = threading.Thread(target=self._periodic_scan_thread, daemon=False)
-        self.periodic_thread.start()
+        # İlk tarama hemen, sonrakiler aralık + jitter ile zamanlayıcı thread'inde
+        self.periodic_coalesced = 0
+        self.table_churn = 0
+        if self.scheduler is None:
+            self.scheduler = ScanScheduler()
+        self.scheduler.schedule("periodic", self._periodic_scan_tick, effective_interval,
+                                jitter=self.scan_jitter)
+        self.scheduler.start()
+        self.periodic_thread = self.scheduler.thread
         
-        self.logger.info(f"Periyodik tarama başlatıldı (Her {self.scan_interval} saatte bir)")
+        self.logger.info(f"Periyodik tarama başlatıldı (Her {self.periodic_interval} saniyede bir)")
         return True
     
     def stop_periodic_scan(self):
@@ -349,124 +3008,527 @@ class ARPScanner:
         except Exception as e:
             self.logger.error(f"Periyodik tarama durumu kaydedilirken hata: {e}")
         
-        # Thread halen çalışıyorsa sonlanmasını bekle
-        if self.periodic_thread and self.periodic_thread.is_alive():
-            self.logger.info("Periyodik tarama thread'i sonlanana kadar bekleniyor...")
-            # Thread'i uygun şekilde sonlana kadar bekle (timeout ile)
-            self.periodic_thread.join(timeout=2.0)
-            
-            if self.periodic_thread.is_alive():
-                self.logger.warning("Periyodik tarama thread'i sonlanmadı, devam ediliyor")
-            else:
-                self.logger.info("Periyodik tarama thread'i başarıyla sonlandı")
+        # Zamanlayıcı bekleme sırasında hemen uyanır ve sonlanır
+        self.scheduler.cancel("periodic")
+        if self.scheduler.stop(timeout=2.0):
+            self.logger.info("Periyodik tarama thread'i başarıyla sonlandı")
+        else:
+            self.logger.warning("Periyodik tarama thread'i sonlanmadı, devam ediliyor")
         
         self.logger.info("Periyodik tarama durduruldu")
         return True
     
+    def start_monitor(self):
+        """Netlink komşu bildirimleriyle olay tabanlı izlemeyi başlatır"""
+        if self.monitor_running:
+            self.logger.warning("İzleme modu zaten çalışıyor")
+            return False
+        
+        try:
+            # Döküm ile abonelik arasında olay kaçırmamak için önce abone ol
+            sock = open_neigh_monitor_socket()
+        except (OSError, AttributeError) as e:
+            self.logger.error(f"Netlink izleme soketi açılamadı: {e}")
+            return False
+        
+        self.monitor_running = True
+        self.monitor_stop_event.clear()
+        self.monitor_thread = threading.Thread(target=self._monitor_thread, args=(sock,), daemon=True)
+        self.monitor_thread.start()
+        
+        self.logger.info("İzleme modu başlatıldı (RTNLGRP_NEIGH)")
+        return True
+    
+    def stop_monitor(self):
+        """Olay tabanlı izlemeyi durdurur"""
+        if not self.monitor_running:
+            self.logger.warning("İzleme modu zaten çalışmıyor")
+            return False
+        
+        self.monitor_running = False
+        self.monitor_stop_event.set()
+        
+        if self.monitor_thread and self.monitor_thread.is_alive():
+            self.monitor_thread.join(timeout=2.0)
+            if self.monitor_thread.is_alive():
+                self.logger.warning("İzleme thread'i sonlanmadı, devam ediliyor")
+        
+        self.logger.info("İzleme modu durduruldu")
+        return True
+    
+    def start_sniffer(self, interface=None, replies_only=False, gateway_only=False, engine="recv"):
+        """
+        Pasif ARP paket izlemeyi başlatır (AF_PACKET, root yetkisi gerekir).
+        
+        Args:
+            interface (str): Dinlenecek arayüz; None ise tüm arayüzler
+            replies_only (bool): Çekirdek filtresiyle sadece ARP yanıtlarını al
+            gateway_only (bool): Çekirdek filtresiyle sadece ağ geçidinin paketlerini al
+            engine (str): "recv" (paket başına okuma) ya da "mmap" (TPACKET_V3 halka tampon)
+        """
+        if self.sniffer_running:
+            self.logger.warning("Paket izleme zaten çalışıyor")
+            return False
+        
+        sender_ip = None
+        if gateway_only:
+            sender_ip = get_default_gateway()["ip"]
+            if sender_ip == "Bilinmiyor":
+                self.logger.error("Ağ geçidi bulunamadı, gateway filtresi uygulanamıyor")
+                return False
+        
+        try:
+            if engine == "mmap":
+                capture = TPacketV3Ring(interface, replies_only, sender_ip)
+                frames = capture.frames(self.sniffer_stop_event)
+            else:
+                capture = open_arp_sniffer_socket(interface, replies_only, sender_ip)
+                frames = sniff_frames(capture, self.sniffer_stop_event)
+        except (OSError, AttributeError) as e:
+            self.logger.error(f"ARP paket soketi açılamadı: {e}")
+            return False
+        
+        self.sniffer_running = True
+        self.sniffer_stop_event.clear()
+        self.capture_stats = {"packets": 0, "drops": 0}
+        self.packet_detector = ARPPacketDetector(track_requests=not (replies_only or sender_ip),
+                                                 rate_detector=self.rate_detector)
+        self.sniffer_thread = threading.Thread(target=self._sniffer_thread, args=(capture, frames), daemon=True)
+        self.sniffer_thread.start()
+        
+        self.logger.info(f"Paket izleme başlatıldı (arayüz: {interface or 'tümü'}, motor: {engine})")
+        return True
+    
+    def stop_sniffer(self):
+        """Pasif ARP paket izlemeyi durdurur"""
+        if not self.sniffer_running:
+            self.logger.warning("Paket izleme zaten çalışmıyor")
+            return False
+        
+        self.sniffer_running = False
+        self.sniffer_stop_event.set()
+        
+        if self.sniffer_thread and self.sniffer_thread.is_alive():
+            self.sniffer_thread.join(timeout=2.0)
+            if self.sniffer_thread.is_alive():
+                self.logger.warning("Paket izleme thread'i sonlanmadı, devam ediliyor")
+        
+        self.logger.info("Paket izleme durduruldu")
+        return True
+    
     def stop(self):
         """Tüm tarama işlemlerini durdurur"""
+        # Paket izlemeyi durdur
+        if self.sniffer_running:
+            self.stop_sniffer()
+        
+        # Olay tabanlı izlemeyi durdur
+        if self.monitor_running:
+            self.stop_monitor()
+        
         # Periyodik taramayı durdur
         if self.periodic_running:
             self.stop_periodic_scan()
         
+        # Bekleyen takip taramasını iptal et
+        with self.scan_lock:
+            pending, self.pending_scan = self.pending_scan, None
+            current = self.scan_future
+        if pending is not None:
+            pending[0].cancel()
+        
         # Tek seferlik taramayı durdur
-        if self.running:
-            self.running = False
+        if current is not None and not current.done():
             self.stop_event.set()  # Durdurma sinyali gönder
             
-            # Thread halen çalışıyorsa sonlanmasını bekle
-            if self.scan_thread and self.scan_thread.is_alive():
-                self.logger.info("Tarama thread'i sonlanana kadar bekleniyor...")
-                self.scan_thread.join(timeout=1.0)
-                
-                if self.scan_thread.is_alive():
-                    self.logger.warning("Tarama thread'i sonlanmadı, devam ediliyor")
-                else:
-                    self.logger.info("Tarama thread'i başarıyla sonlandı")
+            # Tarama halen çalışıyorsa sonlanmasını bekle
+            self.logger.info("Tarama sonlanana kadar bekleniyor...")
+            wait([current], timeout=1.0)
+            
+            if not current.done():
+                self.logger.warning("Tarama sonlanmadı, devam ediliyor")
+            else:
+                self.logger.info("Tarama başarıyla sonlandı")
+        
+        # İşçi thread'ini serbest bırak; sonraki tarama yeni bir executor oluşturur
+        with self.scan_lock:
+            executor, self.scan_executor = self.scan_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
         
         self.logger.info("Tüm tarama işlemleri durduruldu")
     
-    def _scan_thread(self):
-        """Tarama işlemini gerçekleştiren thread"""
+    def _scan_worker(self, future, sweep):
+        """Taramayı ve sırada birleşmiş takip taramasını işçi thread'inde çalıştırır"""
+        while True:
+            # İptal edilmiş istekler çalıştırılmaz
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._scan_thread(sweep))
+                except Exception as e:
+                    future.set_exception(e)
+                    # Future'ı beklemeyen çağıranlar (arayüz, periyodik tarama) da haberdar olsun
+                    if self.error_callback:
+                        try:
+                            self.error_callback(e)
+                        except Exception as callback_error:
+                            self.logger.error(f"Tarama hata bildirimi işlenirken hata: {callback_error}")
+            
+            with self.scan_lock:
+                pending, self.pending_scan = self.pending_scan, None
+                if pending is None:
+                    self.running = False
+                    self.scan_future = None
+                    return
+                future, sweep = pending
+                self.scan_future = future
+    
+    def _scan_thread(self, sweep=False):
+        """
+        Tarama işlemini gerçekleştirir.
+        
+        Returns:
+            dict: Tarama sonucu
+        """
         try:
             self.logger.info("Tarama başlıyor...")
             
             # Tarama başlangıç zamanı
             start_time = time.time()
             
+            # Aktif tarama: önbellekte olmayan sessiz cihazları da bul
+            swept = []
+            if sweep:
+                try:
+                    swept = arp_sweep(rate=self.sweep_rate)
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"Aktif ARP taraması yapılamadı: {e}")
+            
             # ARP tablosunu al
             arp_table = get_arp_table()
             
-            # ARP tablosundan gateway bilgisini al
-            gateway = get_default_gateway()
+            # Aktif taramada görülen ve tabloda olmayan eşlemeleri ekle
+            if swept:
+                known = {(entry["ip"], entry["mac"].lower()) for entry in arp_table}
+                arp_table.extend(entry for entry in swept if (entry["ip"], entry["mac"]) not in known)
             
-            # ARP spoofing tespiti yap
-            suspicious = detect_arp_spoofing(arp_table)
-            
-            # Tehdit seviyesini belirle
-            threat_level = "none"  # Varsayılan olarak tehdit yok
-            
-            # Yüksek tehdit varsa seviyeyi yükselt
-            if any(entry.get("threat_level") == "high" for entry in suspicious):
-                threat_level = "high"
-            # Orta seviye tehdit varsa ve henüz yüksek seviye tespit edilmediyse
-            elif any(entry.get("threat_level") == "medium" for entry in suspicious):
-                threat_level = "medium"
-            
-            # Sonuçları hazırla
-            result = {
-                "timestamp": time.time(),
-                "arp_table": arp_table,
-                "gateway": gateway,
-                "suspicious_entries": suspicious,
-                "threat_level": threat_level,
-                "duration": time.time() - start_time
-            }
+            # Tespit yap, sonucu kaydet ve bildir
+            result = self._process_arp_table(arp_table, start_time, from_scan=True)
+            threat_level = result["threat_level"]
             
-            # Geçmişe ekle (en fazla son 100 taramayı tut)
+            self.logger.info(f"Tarama tamamlandı. Tehdit seviyesi: {threat_level}")
+            return result
+        except Exception as e:
+            self.logger.error(f"Tarama sırasında hata: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def _process_arp_table(self, arp_table, start_time, extra_findings=None, capture_stats=None,
+                           track_bindings=True, from_scan=False):
+        """
+        ARP tablosu üzerinde tespit yapar, sonucu geçmişe ekler ve callback'i çağırır.
+        
+        Periyodik aralık sadece tarama sonuçlarıyla (from_scan) gevşetilir; izleme
+        ve paket yakalama sonuçları aralığı yalnızca sıklaştırabilir.
+        """
+        # Geçmişte ve tespitte sıkıştırılmış tablo kullan
+        arp_table = ARPTable.from_entries(arp_table)
+        
+        # ARP tablosundan gateway bilgisini al (tarama başına tek sorgu)
+        gateway = get_default_gateway(arp_table)
+        
+        # Tablo ve gateway önceki taramayla aynıysa tespiti tekrarlama
+        self.trusted_bindings.reload_if_changed()
+        fingerprint = (arp_table.fingerprint(),
+                       gateway.get("ip"), gateway.get("mac"), gateway.get("interface"),
+                       self.trusted_bindings.signature, len(self.rule_engine.rules))
+        # Önbellek tarama, izleme ve paket izleme thread'leri arasında paylaşılır
+        with self.history_lock:
+            cache = self.detection_cache
+        table_unchanged = cache is not None and cache["fingerprint"] == fingerprint
+        if table_unchanged:
+            # Bulgular aynı; tablo ise güncel komşu durumlarını göstersin diye yeni okunan kalır
+            table_findings = list(cache["findings"])
+            rule_timings = {}
+        else:
+            # ARP spoofing tespiti yap
+            table_findings = detect_arp_spoofing(arp_table, gateway, self.rule_engine)
+            rule_timings = dict(self.rule_engine.timings)
+            with self.history_lock:
+                self.detection_cache = {"fingerprint": fingerprint, "findings": list(table_findings)}
+        
+        # Paket izlemeden gelen bulgular
+        event_findings = list(extra_findings) if extra_findings else []
+        
+        # Gateway MAC'i öğrenilen taban çizgisinden farklı mı kontrol et
+        baseline_finding = self.gateway_baseline.check(gateway, start_time)
+        if baseline_finding is not None:
+            event_findings.append(baseline_finding)
+        
+        # Gateway MAC'inin üreticisi değişti mi kontrol et
+        vendor_finding = self._check_gateway_vendor(gateway)
+        if vendor_finding is not None:
+            event_findings.append(vendor_finding)
+        
+        # Önceki taramaya göre değişen eşlemeleri bul
+        # (izleme modu olayları doğrudan takipçiye uygular; aynı tablo değişiklik üretmez)
+        if track_bindings and not table_unchanged:
+            with self.history_lock:
+                initialized = self.binding_tracker.initialized
+                diff = self.binding_tracker.update(arp_table)
+                event_findings.extend(diff["findings"])
+                # İlk tarama tüm tabloyu "eklenmiş" sayar, değişim sayılmaz
+                if initialized:
+                    self.table_churn += len(diff["added"]) + len(diff["removed"]) + len(diff["changed"])
+        
+        suspicious = event_findings + table_findings
+        
+        # Tehdit kartları için MAC üreticilerini ekle
+        for entry in suspicious:
+            if "mac" in entry and "vendor" not in entry:
+                vendor = lookup_vendor(entry["mac"])
+                if vendor is not None:
+                    entry["vendor"] = vendor
+        
+        # Tehdit seviyesini belirle
+        threat_level = get_threat_level(suspicious)
+        
+        # Tekrarlanan bulguları olaylarla birleştir
+        with self.history_lock:
+            incidents = self.incident_tracker.update(table_findings, event_findings, start_time)
+        
+        # Sonuçları hazırla
+        result = {
+            "timestamp": time.time(),
+            "arp_table": arp_table,
+            "gateway": gateway,
+            "suspicious_entries": suspicious,
+            "threat_level": threat_level,
+            "incidents": incidents,
+            # Bulgular önceki taramayla aynıysa tüketiciler yeniden çizimi atlayabilir
+            "unchanged": table_unchanged and not event_findings,
+            "duration": time.time() - start_time,
+            "rule_timings": rule_timings
+        }
+        
+        # Paket izleme sayaçlarını ekle
+        if capture_stats is not None:
+            result["capture_stats"] = dict(capture_stats)
+        
+        # Periyodik taramanın aralığını sonuca göre uyarla, gecikme ve kaçırma sayaçlarını ekle
+        if self.periodic_running:
+            self._adapt_cadence(result, from_scan)
+            result["effective_interval"] = self.cadence.interval
+            result["schedule"] = self.get_schedule_stats()
+        
+        # Geçmişe ekle (en fazla son 100 taramayı tut)
+        with self.history_lock:
             self.scan_history.append(result)
             if len(self.scan_history) > 100:
                 self.scan_history = self.scan_history[-100:]
+        
+        # Callback fonksiyonu varsa çağır
+        if self.callback:
+            self.callback(result)
+        
+        return result
+    
+    def _check_gateway_vendor(self, gateway):
+        """
+        Gateway MAC üreticisini önceki taramayla karşılaştırır.
+        
+        Args:
+            gateway (dict): get_default_gateway() sonucu (üretici bilgisi eklenir)
             
-            # Callback fonksiyonu varsa çağır
-            if self.callback:
-                self.callback(result)
+        Returns:
+            dict: Üretici değiştiyse yüksek seviyeli bulgu, değilse None
+        """
+        mac = gateway.get("mac", "Bilinmiyor")
+        if gateway.get("ip", "Bilinmiyor") == "Bilinmiyor" or mac == "Bilinmiyor":
+            return None
+        
+        vendor = lookup_vendor(mac)
+        if vendor is None:
+            return None
+        gateway["vendor"] = vendor
+        
+        key = (gateway["ip"], gateway.get("interface"))
+        with self.history_lock:
+            previous = self.gateway_vendors.get(key)
+            self.gateway_vendors[key] = vendor
+        
+        if previous is None or previous == vendor:
+            return None
+        return {
+            "type": "gateway_vendor_changed",
+            "ip": gateway["ip"],
+            "mac": mac,
+            "old_vendor": previous,
+            "vendor": vendor,
+            "threat_level": "high",
+            "message": f"❌ TEHLİKE: Ağ geçidi {gateway['ip']} MAC üreticisi değişti: {previous} -> {vendor} ({mac})"
+        }
+    
+    def _apply_neigh_events(self, table, events, now):
+        """
+        Komşu tablosu bildirimlerini yerel tabloya ve eşleme takipçisine uygular.
+        
+        Args:
+            table (dict): (IP, arayüz) -> kayıt; yerinde güncellenir
+            events (list): parse_neigh_dump() olayları
+            now (float): Olay zamanı
             
-            self.logger.info(f"Tarama tamamlandı. Tehdit seviyesi: {threat_level}")
+        Returns:
+            tuple: (tespit gerekiyor mu, MAC değişikliği bulguları)
+        """
+        changed = False
+        findings = []
+        
+        for event in events:
+            key = (event["ip"], event["interface"])
+            deleted = event.pop("deleted")
+            if deleted or event["mac"] is None or event["state"] in ("FAILED", "NOARP"):
+                # Kayıt silindi ya da çözümlenemez hale geldi
+                if table.pop(key, None) is not None:
+                    changed = True
+                    with self.history_lock:
+                        self.table_churn += 1
+                        self.binding_tracker.apply_event(event["ip"], event["interface"], None, deleted=True)
+                continue
+            
+            previous = table.get(key)
+            table[key] = event
+            # Sadece durum değişikliği (REACHABLE -> STALE) tespiti tetiklemez
+            if previous is None or previous["mac"].lower() != event["mac"].lower():
+                changed = True
+                with self.history_lock:
+                    self.table_churn += 1
+                    flips = self.binding_tracker.apply_event(event["ip"], event["interface"], event["mac"])
+                    if flips:
+                        flips.extend(self.rate_detector.observe_flip(event["ip"], event["mac"], now))
+                    findings.extend(flips)
+        
+        return changed, findings
+    
+    def _monitor_thread(self, sock):
+        """Komşu tablosu bildirimlerini dinleyip her değişiklikte tespit yapan thread"""
+        try:
+            # Başlangıç durumunu tam döküm ile oluştur
+            table = {(entry["ip"], entry["interface"]): entry for entry in get_arp_table()}
+            with self.history_lock:
+                self.binding_tracker.update(list(table.values()))
+            ifname_cache = {}
+            
+            while not self.monitor_stop_event.is_set():
+                # Olay yoksa uyu; durdurma sinyali için en geç 1 saniyede bir uyan
+                readable, _, _ = select.select([sock], [], [], 1.0)
+                if not readable:
+                    continue
+                
+                start_time = time.time()
+                try:
+                    data = sock.recv(1 << 16)
+                except OSError as e:
+                    if e.errno != errno.ENOBUFS:
+                        raise
+                    # Olay seli bildirim kuyruğunu taşırdı; kaçan değişiklikleri tam dökümle bul
+                    self.logger.warning("Komşu bildirimleri taştı (ENOBUFS), tablo yeniden okunuyor")
+                    table = {(entry["ip"], entry["interface"]): entry for entry in get_arp_table()}
+                    self._process_arp_table(list(table.values()), start_time)
+                    continue
+                events, _ = parse_neigh_dump(data, ifname_cache)
+                changed, findings = self._apply_neigh_events(table, events, start_time)
+                
+                if changed:
+                    result = self._process_arp_table(list(table.values()), start_time, findings,
+                                                     track_bindings=False)
+                    self.logger.debug(f"Komşu değişikliği işlendi. Tehdit seviyesi: {result['threat_level']}")
         except Exception as e:
-            self.logger.error(f"Tarama sırasında hata: {e}")
+            self.logger.error(f"İzleme sırasında hata: {e}")
             import traceback
             traceback.print_exc()
         finally:
-            self.running = False
+            sock.close()
+            self.monitor_running = False
     
-    def _periodic_scan_thread(self):
-        """Periyodik tarama işlemini gerçekleştiren thread"""
+    def _sniffer_thread(self, capture, frames, publish_interval=1.0):
+        """ARP paketlerini işleme hattından geçirip bulguları yayınlayan thread"""
+        sock = getattr(capture, "sock", capture)
         try:
-            self.logger.info(f"Periyodik tarama başlatıldı (Her {self.scan_interval} saatte bir)")
+            pending = []
+            last_publish = 0.0
+            pipeline = detect_arp_packets(parse_arp_packets(frames), self.packet_detector)
             
-            while self.periodic_running and not self.stop_event.is_set():
-                # Hemen bir tarama başlat
-                if not self.running:  # Eğer halihazırda bir tarama çalışmıyorsa
-                    self.start_scan()
-                
-                # Bir sonraki taramaya kadar bekle
-                # Her 10 saniyede bir durdurma sinyalini kontrol et
-                interval_seconds = self.scan_interval * 3600  # saat -> saniye
-                wait_start = time.time()
+            for findings in pipeline:
+                # Bilgi amaçlı bulgular tek başına yayın tetiklemez
+                if any(f["threat_level"] != "none" for f in findings):
+                    pending.extend(findings)
+                if not pending:
+                    continue
                 
-                while time.time() - wait_start < interval_seconds:
-                    if self.stop_event.is_set() or not self.periodic_running:
-                        break
-                    time.sleep(10)  # 10 saniye bekle ve kontrol et
-            
-            self.logger.info("Periyodik tarama döngüsü sona erdi")
+                # ARP fırtınasında callback'i boğmamak için bulguları gruplayarak yayınla
+                now = time.time()
+                if now - last_publish >= publish_interval:
+                    # Çekirdek sayaçlarını biriktir (okuma sayaçları sıfırlar)
+                    stats = get_packet_statistics(sock)
+                    self.capture_stats["packets"] += stats["packets"]
+                    self.capture_stats["drops"] += stats["drops"]
+                    try:
+                        arp_table = get_arp_table()
+                    except ARPTableError as e:
+                        self.logger.error(f"ARP tablosu alınamadı, sadece paket bulguları yayınlanıyor: {e}")
+                        arp_table = []
+                    result = self._process_arp_table(arp_table, now, pending, self.capture_stats)
+                    self.logger.warning(f"Paket izleme {len(pending)} bulgu yayınladı. Tehdit seviyesi: {result['threat_level']}")
+                    pending = []
+                    last_publish = now
         except Exception as e:
-            self.logger.error(f"Periyodik tarama sırasında hata: {e}")
+            self.logger.error(f"Paket izleme sırasında hata: {e}")
             import traceback
             traceback.print_exc()
         finally:
-            self.periodic_running = False
+            frames.close()
+            capture.close()
+            self.sniffer_running = False
+    
+    def _periodic_scan_tick(self):
+        """Zamanlayıcının her periyotta çağırdığı tarama tetikleyicisi"""
+        if not self.periodic_running:
+            return
+        if self.running:
+            # Önceki tarama hâlâ sürüyor; istek takip taramasında birleşir
+            self.periodic_coalesced += 1
+        self.start_scan()
+    
+    def _adapt_cadence(self, result, from_scan):
+        """Tarama sonucuna göre periyodik aralığı sıklaştırır ya da gevşetir"""
+        with self.history_lock:
+            if not from_scan and not self.cadence.should_tighten(result, self.table_churn):
+                return
+            churn, self.table_churn = self.table_churn, 0
+        previous = self.cadence.interval
+        interval = self.cadence.update(result, churn)
+        if interval < previous:
+            # Sıklaştırmada bir sonraki taramayı yeni aralık kadar sonraya çek
+            self.scheduler.reschedule("periodic", interval=interval, delay=interval)
+            self.logger.info(f"Tarama aralığı sıklaştırıldı: {interval:g} saniye")
+        elif interval != previous:
+            self.scheduler.reschedule("periodic", interval=interval)
+    
+    def get_schedule_stats(self):
+        """
+        Periyodik taramanın zamanlama istatistiklerini döndürür.
+        
+        Returns:
+            dict: ScanScheduler.stats() alanları ve birleşen istek sayısı; periyodik tarama yoksa None
+        """
+        if self.scheduler is None:
+            return None
+        stats = self.scheduler.stats("periodic")
+        if stats is not None:
+            stats["coalesced"] = self.periodic_coalesced
+        return stats
     
     def get_last_scan_result(self):
         """En son tarama sonucunu döndürür"""
@@ -477,3 +3539,32 @@ class ARPScanner:
     def get_scan_history(self):
         """Tarama geçmişini döndürür"""
         return self.scan_history
+    
+    def get_open_incidents(self):
+        """Açık olayları döndürür"""
+        with self.history_lock:
+            return self.incident_tracker.open_incidents()
+    
+    def accept_gateway_mac(self, ip, interface, mac):
+        """
+        Gateway'in yeni MAC adresini meşru kabul eder (ör. router değişimi sonrası).
+        
+        Args:
+            ip (str): Gateway IP adresi
+            interface (str): Arayüz adı
+            mac (str): Onaylanan MAC adresi
+        """
+        self.gateway_baseline.accept(ip, interface, mac)
+
+if __name__ == "__main__":
+    # Kayıtlı yakalamaları arayüz olmadan analiz et:
+    #   python -m modules.arp_detector yakalama.pcap [yakalama2.pcapng ...]
+    logging.basicConfig(level=logging.INFO)
+    for capture_path in sys.argv[1:]:
+        replay_result = replay_pcap(capture_path)
+        print(json.dumps({
+            "file": capture_path,
+            "threat_level": replay_result["threat_level"],
+            "suspicious_entries": len(replay_result["suspicious_entries"]),
+            "stats": replay_result["stats"],
+        }, ensure_ascii=False))
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Asenkron ARP Tarayıcı Modülü
+Bu modül, ARP spoofing tespitini asyncio tabanlı servislere gömmek için
+thread kullanmayan bir tarayıcı içerir. Netlink ve paket soketleri olay
+döngüsüne kaydedilir; tespit mantığı ve sonuç biçimi ARPScanner ile aynıdır.
+"""
+
+import asyncio
+import errno
+import functools
+import socket
+import time
+import logging
+
+from modules.arp_detector import (
+    ARPScanner, ARPPacketDetector, ARPTableError, NETLINK_ROUTE,
+    build_neigh_dump_request, neigh_table_entries, parse_neigh_dump,
+    open_neigh_monitor_socket, open_arp_sniffer_socket, parse_arp_frame,
+    get_arp_table, get_packet_statistics, arp_sweep,
+)
+
+# Loglama
+logger = logging.getLogger("V-ARP.async_scanner")
+
+# Tek uyanışta işlenecek en fazla çerçeve (kalanlar sonraki döngü turunda işlenir)
+SNIFFER_FRAMES_PER_WAKEUP = 256
+
+# Netlink komşu tablosunu olay döngüsünü bloklamadan okuma
+async def get_arp_table_netlink_async(include_incomplete=False):
+    """
+    Komşu tablosunu bloklamayan bir netlink soketiyle döker.
+
+    Args:
+        include_incomplete (bool): MAC adresi çözülmemiş kayıtları da döndür
+
+    Returns:
+        list: {"ip", "mac", "interface", "state"} kayıtları listesi
+    """
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    try:
+        sock.setblocking(False)
+        sock.bind((0, 0))
+        await loop.sock_sendall(sock, build_neigh_dump_request(int(time.time())))
+
+        arp_entries = []
+        ifname_cache = {}
+        done = False
+        while not done:
+            entries, done = parse_neigh_dump(await loop.sock_recv(sock, 1 << 16), ifname_cache)
+            arp_entries.extend(neigh_table_entries(entries, include_incomplete))
+        return arp_entries
+    finally:
+        sock.close()
+
+async def get_arp_table_async():
+    """
+    ARP tablosunu asenkron olarak alır.
+
+    Netlink kullanılabiliyorsa doğrudan olay döngüsünde okunur; değilse
+    (Windows, netlink olmayan sistemler) kayıtlı kaynaklar varsayılan
+    executor'da çalıştırılır.
+
+    Returns:
+        list: ARP tablosu kayıtları
+    """
+    if hasattr(socket, "AF_NETLINK"):
+        try:
+            return await get_arp_table_netlink_async()
+        except OSError as e:
+            logger.debug(f"Asenkron netlink dökümü yapılamadı, kayıtlı kaynak kullanılıyor: {e}")
+    return await asyncio.get_running_loop().run_in_executor(None, get_arp_table)
+
+class AsyncARPScanner(ARPScanner):
+    """
+    asyncio ile kullanılan ARP tarayıcı.
+
+    ARPScanner'ın tespit, eşleme takibi, olay birleştirme ve geçmiş mantığını
+    kullanır; tarama başına thread açmaz. Tespit ve geçmiş kaydı (OUI dizini,
+    taban çizgisi dosyası gibi disk işleri içerir) varsayılan executor'da
+    çalışır, olay döngüsü bloklanmaz. Örnek:
+
+        scanner = AsyncARPScanner()
+        result = await scanner.scan()
+        async for result in scanner.watch("netlink"):
+            ...
+    """
+    def __init__(self, callback=None, error_callback=None):
+        super().__init__(callback, error_callback)
+        self.logger = logging.getLogger("V-ARP.AsyncARPScanner")
+
+    async def _process_arp_table_async(self, *args, **kwargs):
+        """_process_arp_table'ı olay döngüsü dışında çalıştırır"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._process_arp_table, *args, **kwargs))
+
+    async def scan(self, sweep=False):
+        """
+        Tek seferlik tarama yapar.
+
+        Args:
+            sweep (bool): Tablo okunmadan önce alt ağı aktif ARP istekleriyle tara
+
+        Returns:
+            dict: ARPScanner ile aynı biçimde tarama sonucu
+        """
+        start_time = time.time()
+
+        # Aktif tarama bekleme içeren bloklayan bir işlemdir, executor'da çalışır
+        swept = []
+        if sweep:
+            try:
+                swept = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: arp_sweep(rate=self.sweep_rate))
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Aktif ARP taraması yapılamadı: {e}")
+
+        arp_table = await get_arp_table_async()
+
+        # Aktif taramada görülen ve tabloda olmayan eşlemeleri ekle
+        if swept:
+            known = {(entry["ip"], entry["mac"].lower()) for entry in arp_table}
+            arp_table.extend(entry for entry in swept if (entry["ip"], entry["mac"]) not in known)
+
+        result = await self._process_arp_table_async(arp_table, start_time, from_scan=True)
+        self.logger.info(f"Tarama tamamlandı. Tehdit seviyesi: {result['threat_level']}")
+        return result
+
+    async def watch(self, source="netlink", interval=60.0, interface=None, replies_only=False,
+                    publish_interval=1.0):
+        """
+        Sonuç akışı üretir (async for ile kullanılır).
+
+        Args:
+            source (str): "netlink" (komşu tablosu bildirimleri), "sniffer" (ARP
+                paket izleme, root gerekir) ya da "poll" (interval saniyede bir tarama)
+            interval (float): "poll" kaynağında taramalar arası süre (saniye)
+            interface (str): "sniffer" kaynağında dinlenecek arayüz
+            replies_only (bool): "sniffer" kaynağında sadece ARP yanıtlarını al
+            publish_interval (float): "sniffer" kaynağında bulguların en sık yayınlanma aralığı
+
+        Yields:
+            dict: Tarama sonuçları
+        """
+        if source == "netlink":
+            watcher = self._watch_netlink()
+        elif source == "sniffer":
+            watcher = self._watch_sniffer(interface, replies_only, publish_interval)
+        elif source == "poll":
+            watcher = self._watch_poll(interval)
+        else:
+            raise ValueError(f"Bilinmeyen izleme kaynağı: {source}")
+
+        try:
+            async for result in watcher:
+                yield result
+        finally:
+            await watcher.aclose()
+
+    async def _watch_poll(self, interval):
+        """Belirli aralıklarla tarama yapar"""
+        while True:
+            yield await self.scan()
+            await asyncio.sleep(interval)
+
+    async def _watch_netlink(self):
+        """Komşu tablosu bildirimlerinde tespit yapar"""
+        loop = asyncio.get_running_loop()
+        sock = open_neigh_monitor_socket()
+        try:
+            sock.setblocking(False)
+
+            # Başlangıç durumunu tam döküm ile oluştur (abonelikten sonra, olay kaçmasın)
+            result = await self.scan()
+            table = {(entry["ip"], entry["interface"]): entry for entry in result["arp_table"]}
+            yield result
+
+            ifname_cache = {}
+            while True:
+                try:
+                    data = await loop.sock_recv(sock, 1 << 16)
+                except OSError as e:
+                    if e.errno != errno.ENOBUFS:
+                        raise
+                    # Olay seli bildirim kuyruğunu taşırdı; kaçan değişiklikleri tam dökümle bul
+                    self.logger.warning("Komşu bildirimleri taştı (ENOBUFS), tablo yeniden okunuyor")
+                    start_time = time.time()
+                    table = {(entry["ip"], entry["interface"]): entry for entry in await get_arp_table_async()}
+                    yield await self._process_arp_table_async(list(table.values()), start_time)
+                    continue
+                start_time = time.time()
+                events, _ = parse_neigh_dump(data, ifname_cache)
+                changed, findings = self._apply_neigh_events(table, events, start_time)
+                if changed:
+                    yield await self._process_arp_table_async(list(table.values()), start_time, findings,
+                                                              track_bindings=False)
+        finally:
+            sock.close()
+
+    async def _watch_sniffer(self, interface, replies_only, publish_interval):
+        """ARP paketlerini olay döngüsünde işler, bulguları gruplayarak yayınlar"""
+        loop = asyncio.get_running_loop()
+        sock = open_arp_sniffer_socket(interface, replies_only)
+        sock.setblocking(False)
+        self.capture_stats = {"packets": 0, "drops": 0}
+        self.packet_detector = ARPPacketDetector(track_requests=not replies_only,
+                                                 rate_detector=self.rate_detector)
+        pending = []
+        arrived = asyncio.Event()
+
+        def on_readable():
+            # Biriken çerçeveleri işle; ARP selinde olay döngüsünü aç bırakmamak için
+            # uyanış başına sınırlı sayıda çerçeve al, soket okunabilir kaldıkça yeniden çağrılır
+            for _ in range(SNIFFER_FRAMES_PER_WAKEUP):
+                try:
+                    frame = sock.recv(65535)
+                except (BlockingIOError, InterruptedError):
+                    break
+                packet = parse_arp_frame(frame, time.time())
+                if packet is None:
+                    continue
+                findings = self.packet_detector.process(packet)
+                # Bilgi amaçlı bulgular tek başına yayın tetiklemez
+                if any(f["threat_level"] != "none" for f in findings):
+                    pending.extend(findings)
+                    arrived.set()
+
+        loop.add_reader(sock.fileno(), on_readable)
+        try:
+            last_publish = 0.0
+            while True:
+                await arrived.wait()
+
+                # ARP fırtınasında tüketiciyi boğmamak için bulguları gruplayarak yayınla
+                delay = last_publish + publish_interval - time.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                arrived.clear()
+
+                now = time.time()
+                stats = get_packet_statistics(sock)
+                self.capture_stats["packets"] += stats["packets"]
+                self.capture_stats["drops"] += stats["drops"]
+                try:
+                    arp_table = await get_arp_table_async()
+                except ARPTableError as e:
+                    self.logger.error(f"ARP tablosu alınamadı, sadece paket bulguları yayınlanıyor: {e}")
+                    arp_table = []
+                findings, pending[:] = list(pending), []
+                last_publish = now
+                yield await self._process_arp_table_async(arp_table, now, findings, self.capture_stats)
+        finally:
+            loop.remove_reader(sock.fileno())
+            sock.close()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+OUI Üretici Modülü
+Bu modül, IEEE OUI listesinden MAC adreslerinin üretici bilgisini bulmak için
+fonksiyonlar içerir. Metin listesi bir kez sıralı ikili dosyaya çevrilir, sonraki
+açılışlarda bu dosya belleğe eşlenip (mmap) ikili arama ile sorgulanır.
+"""
+
+import os
+import re
+import csv
+import mmap
+import struct
+import threading
+import logging
+
+# Loglama
+logger = logging.getLogger("V-ARP.oui")
+
+# Dosya yolları
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUI_INDEX_FILE = os.path.join(APP_DIR, "oui.bin")
+
+# IEEE OUI listesinin aranacağı yerler (ilk bulunan kullanılır)
+OUI_SOURCE_PATHS = [
+    os.path.join(APP_DIR, "assets", "oui.txt"),
+    os.path.join(APP_DIR, "assets", "oui.csv"),
+    "/usr/share/ieee-data/oui.txt",
+    "/usr/share/ieee-data/oui.csv",
+    "/usr/share/hwdata/oui.txt",
+    "/usr/share/misc/oui.txt",
+]
+
+# İkili dizin biçimi: başlık + sabit boyutlu kayıtlar (OUI, isim ofseti, isim uzunluğu) + isimler
+_INDEX_MAGIC = b"VOUI"
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("!4sHI")
+_INDEX_RECORD = struct.Struct("!IIB")
+
+# "00-22-72   (hex)		Şirket Adı" satırları
+_OUI_HEX_LINE = re.compile(r"^\s*([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})\s+\(hex\)\s+(.+?)\s*$")
+
+def parse_oui_source(path):
+    """
+    IEEE OUI listesini (oui.txt veya oui.csv) okur.
+
+    Args:
+        path (str): Liste dosyasının yolu
+
+    Returns:
+        dict: 24 bitlik OUI -> üretici adı
+    """
+    vendors = {}
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        if path.lower().endswith(".csv"):
+            # Registry,Assignment,Organization Name,Organization Address
+            for row in csv.reader(f):
+                if len(row) < 3 or len(row[1]) != 6:
+                    continue
+                try:
+                    vendors[int(row[1], 16)] = row[2].strip()
+                except ValueError:
+                    continue
+        else:
+            for line in f:
+                match = _OUI_HEX_LINE.match(line)
+                if match:
+                    vendors[int("".join(match.group(1, 2, 3)), 16)] = match.group(4)
+    return vendors
+
+def build_oui_index(source, dest=OUI_INDEX_FILE):
+    """
+    OUI listesini sıralı ikili dizin dosyasına çevirir.
+
+    Args:
+        source (str): IEEE OUI liste dosyası
+        dest (str): Yazılacak ikili dizin dosyası
+
+    Returns:
+        int: Dizindeki kayıt sayısı
+    """
+    vendors = parse_oui_source(source)
+
+    records = bytearray()
+    names = bytearray()
+    name_offsets = {}
+    for oui in sorted(vendors):
+        # Aynı üretici adı bir kez yazılır
+        name = vendors[oui].encode("utf-8")[:255]
+        offset = name_offsets.get(name)
+        if offset is None:
+            offset = name_offsets[name] = len(names)
+            names += name
+        records += _INDEX_RECORD.pack(oui, offset, len(name))
+
+    # Yarım kalmış dosya okunmasın diye önce geçici dosyaya yaz
+    temp_path = dest + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, len(vendors)))
+        f.write(records)
+        f.write(names)
+    os.replace(temp_path, dest)
+
+    logger.info(f"OUI dizini oluşturuldu: {len(vendors)} kayıt ({dest})")
+    return len(vendors)
+
+class OUIIndex:
+    """
+    Belleğe eşlenmiş ikili OUI dizini üzerinde ikili arama yapar.
+
+    Açılışta dosya ayrıştırılmaz; sadece sorgulanan kayıtlar diskten sayfalanır.
+    Sık sorgulanan OUI'ler küçük bir önbellekte tutulur.
+    """
+    def __init__(self, path=OUI_INDEX_FILE):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = _INDEX_HEADER.unpack_from(self._map, 0)
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+            self._map.close()
+            raise ValueError(f"Geçersiz OUI dizin dosyası: {path}")
+        self._names_offset = _INDEX_HEADER.size + self.count * _INDEX_RECORD.size
+        self._cache = {}
+
+    def lookup_oui(self, oui):
+        """
+        24 bitlik OUI değerinin üreticisini döndürür.
+
+        Args:
+            oui (int): MAC adresinin ilk 3 baytı
+
+        Returns:
+            str: Üretici adı, bulunamazsa None
+        """
+        if oui in self._cache:
+            return self._cache[oui]
+
+        vendor = None
+        low, high = 0, self.count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            value, offset, length = _INDEX_RECORD.unpack_from(
+                self._map, _INDEX_HEADER.size + mid * _INDEX_RECORD.size)
+            if value < oui:
+                low = mid + 1
+            elif value > oui:
+                high = mid - 1
+            else:
+                start = self._names_offset + offset
+                vendor = self._map[start:start + length].decode("utf-8", errors="replace")
+                break
+
+        # Önbellek sınırsız büyümesin
+        if len(self._cache) >= 4096:
+            self._cache.clear()
+        self._cache[oui] = vendor
+        return vendor
+
+    def lookup(self, mac):
+        """
+        MAC adresinin üreticisini döndürür.
+
+        Args:
+            mac (str|int): MAC adresi (metin veya 48 bitlik tamsayı)
+
+        Returns:
+            str: Üretici adı, bulunamazsa None
+        """
+        if isinstance(mac, int):
+            return self.lookup_oui(mac >> 24)
+        digits = re.sub(r"[^0-9A-Fa-f]", "", mac)
+        if len(digits) < 6:
+            return None
+        return self.lookup_oui(int(digits[:6], 16))
+
+    def close(self):
+        """Bellek eşlemesini kapatır"""
+        self._map.close()
+
+# Süreç boyunca tek dizin kullanılır
+_oui_index = None
+_oui_index_loaded = False
+_oui_index_lock = threading.Lock()
+
+def find_oui_source():
+    """Sistemde bulunan ilk IEEE OUI listesinin yolunu döndürür"""
+    for path in OUI_SOURCE_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+def get_oui_index():
+    """
+    Paylaşılan OUI dizinini döndürür, gerekirse ikili dosyayı oluşturur.
+
+    Kaynak liste ikili dosyadan yeniyse dizin yeniden oluşturulur. Liste de
+    dizin de yoksa None döner ve üretici bilgisi gösterilmez.
+
+    Returns:
+        OUIIndex: Dizin nesnesi veya None
+    """
+    global _oui_index, _oui_index_loaded
+    if _oui_index_loaded:
+        return _oui_index
+
+    with _oui_index_lock:
+        if _oui_index_loaded:
+            return _oui_index
+        try:
+            source = find_oui_source()
+            if source is not None and (not os.path.exists(OUI_INDEX_FILE) or
+                                       os.path.getmtime(source) > os.path.getmtime(OUI_INDEX_FILE)):
+                build_oui_index(source)
+            if os.path.exists(OUI_INDEX_FILE):
+                _oui_index = OUIIndex()
+            else:
+                logger.info("OUI listesi bulunamadı, üretici bilgisi gösterilmeyecek.")
+        except Exception as e:
+            logger.error(f"OUI dizini yüklenirken hata: {e}")
+            _oui_index = None
+        _oui_index_loaded = True
+    return _oui_index
+
+def lookup_vendor(mac):
+    """
+    MAC adresinin üreticisini paylaşılan dizinden döndürür.
+
+    Args:
+        mac (str|int): MAC adresi
+
+    Returns:
+        str: Üretici adı, bilinmiyorsa None
+    """
+    index = get_oui_index()
+    if index is None:
+        return None
+    return index.lookup(mac)
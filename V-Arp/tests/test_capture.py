@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Paket Yakalama Testleri
+Çekirdek BPF filtresi, kayıtlı yakalama (pcap) okuyucusu ve paket tabanlı
+tespit için testler. Testler ağ ya da root yetkisi gerektirmez.
+"""
+
+import os
+import socket
+import struct
+import unittest
+
+from modules.arp_detector import (
+    ARPOP_REPLY, ETH_P_ARP, ARPPacketDetector, RequestTimingWheel, parse_arp_frame, compile_arp_bpf, read_pcap_frames, replay_pcap,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Üç çerçeve: 10.0.0.5 -> 10.0.0.1 isteği, gerçek yanıt, başka MAC'ten istenmemiş yanıt
+ARP_SPOOF_PCAP = os.path.join(FIXTURES_DIR, "arp_spoof.pcap")
+
+# Test çerçevesi oluşturma
+def _arp_frame(op, sender_mac, sender_ip, target_mac, target_ip):
+    """60 baytlık Ethernet + ARP çerçevesi oluşturur"""
+    destination = b"\xff" * 6 if op == 1 else target_mac
+    return (struct.pack("!6s6sH", destination, sender_mac, ETH_P_ARP) +
+            struct.pack("!HHBBH6s4s6s4s", 1, 0x0800, 6, 4, op, sender_mac, socket.inet_aton(sender_ip),
+                        target_mac, socket.inet_aton(target_ip)) + b"\x00" * 18)
+
+HOST_MAC = bytes.fromhex("00163e000005")
+GATEWAY_MAC = bytes.fromhex("00163e000001")
+
+# İstek, gerçek yanıt ve 10.0.0.5'ten gelen bir yanıt
+FRAMES = [
+    _arp_frame(1, HOST_MAC, "10.0.0.5", b"\x00" * 6, "10.0.0.1"),
+    _arp_frame(2, GATEWAY_MAC, "10.0.0.1", HOST_MAC, "10.0.0.5"),
+    _arp_frame(2, HOST_MAC, "10.0.0.5", GATEWAY_MAC, "10.0.0.1"),
+]
+
+# Klasik BPF programını çerçeve üzerinde çalıştırma (sadece derleyicinin ürettiği komutlar)
+def _run_bpf(program, frame):
+    """Programın çerçeveyi kabul edip etmediğini döndürür"""
+    pc = 0
+    accumulator = 0
+    while True:
+        code, jt, jf, k = program[pc]
+        if code == 0x28:  # ldh [k]
+            accumulator = struct.unpack_from("!H", frame, k)[0]
+        elif code == 0x20:  # ld [k]
+            accumulator = struct.unpack_from("!I", frame, k)[0]
+        elif code == 0x15:  # jeq #k, jt, jf
+            pc += jt if accumulator == k else jf
+        elif code == 0x06:  # ret #k
+            return k != 0
+        else:
+            raise AssertionError(f"Beklenmeyen BPF komutu: {code:#x}")
+        pc += 1
+
+class CompileArpBpfTest(unittest.TestCase):
+    def setUp(self):
+        ipv4 = bytearray(FRAMES[0])
+        struct.pack_into("!H", ipv4, 12, 0x0800)
+        self.ipv4_frame = bytes(ipv4)
+
+    def test_arp_only(self):
+        program = compile_arp_bpf()
+        self.assertEqual(program[1][3], ETH_P_ARP)
+        self.assertTrue(all(_run_bpf(program, frame) for frame in FRAMES))
+        self.assertFalse(_run_bpf(program, self.ipv4_frame))
+
+    def test_replies_only(self):
+        program = compile_arp_bpf(replies_only=True)
+        self.assertIn(ARPOP_REPLY, [k for _, _, _, k in program])
+        self.assertEqual([_run_bpf(program, frame) for frame in FRAMES], [False, True, True])
+
+    def test_sender_ip(self):
+        program = compile_arp_bpf(replies_only=True, sender_ip="10.0.0.1")
+        self.assertEqual([_run_bpf(program, frame) for frame in FRAMES], [False, True, False])
+        program = compile_arp_bpf(sender_ip="10.0.0.5")
+        self.assertEqual([_run_bpf(program, frame) for frame in FRAMES], [True, False, True])
+
+class ReplayPcapTest(unittest.TestCase):
+    def test_frames(self):
+        frames = [(timestamp, bytes(frame)) for timestamp, frame in read_pcap_frames(ARP_SPOOF_PCAP)]
+        self.assertEqual(len(frames), 3)
+        self.assertAlmostEqual(frames[1][0], 1700000000.1, places=5)
+        self.assertEqual(frames[0][1], FRAMES[0])
+
+    def test_spoofed_reply_detected(self):
+        result = replay_pcap(ARP_SPOOF_PCAP)
+        self.assertEqual(result["stats"]["frames"], 3)
+        self.assertEqual(result["stats"]["arp_packets"], 3)
+        self.assertEqual(result["threat_level"], "high")
+        types = [finding["type"] for finding in result["suspicious_entries"]]
+        self.assertIn("unsolicited_reply", types)
+        self.assertIn("binding_changed", types)
+        self.assertEqual(result["arp_table"],
+                         [{"ip": "10.0.0.1", "mac": "00:16:3e:00:00:ee", "interface": "pcap"}])
+
+class RequestTimingWheelTest(unittest.TestCase):
+    def test_match_consumes_request(self):
+        wheel = RequestTimingWheel(timeout=5.0, tick=0.25)
+        wheel.add("10.0.0.1", "10.0.0.5", 100.0)
+        self.assertEqual(len(wheel), 1)
+        self.assertTrue(wheel.match("10.0.0.1", "10.0.0.5", 101.0))
+        self.assertFalse(wheel.match("10.0.0.1", "10.0.0.5", 101.5))
+        self.assertEqual(len(wheel), 0)
+
+    def test_expiry(self):
+        wheel = RequestTimingWheel(timeout=5.0, tick=0.25)
+        wheel.add("10.0.0.1", "10.0.0.5", 100.0)
+        wheel.advance(106.0)
+        self.assertEqual(len(wheel), 0)
+        self.assertFalse(wheel.match("10.0.0.1", "10.0.0.5", 106.0))
+
+    def test_repeated_request_renews_expiry(self):
+        wheel = RequestTimingWheel(timeout=5.0, tick=0.25)
+        wheel.add("10.0.0.1", "10.0.0.5", 100.0)
+        wheel.add("10.0.0.1", "10.0.0.5", 104.0)
+        wheel.advance(106.0)
+        self.assertTrue(wheel.match("10.0.0.1", "10.0.0.5", 108.0))
+
+    def test_max_entries(self):
+        wheel = RequestTimingWheel(timeout=5.0, tick=0.25, max_entries=2)
+        for i in range(3):
+            wheel.add(f"10.0.0.{i}", "10.0.0.5", 100.0)
+        self.assertEqual(len(wheel), 2)
+        self.assertEqual(wheel.dropped, 1)
+
+    def test_request_in_current_tick_expires_later(self):
+        wheel = RequestTimingWheel(timeout=5.0, tick=0.25)
+        wheel.add("10.0.0.1", "10.0.0.5", 100.1)
+        wheel.advance(105.0)
+        self.assertEqual(len(wheel), 1)
+        wheel.advance(200.0)
+        self.assertEqual(len(wheel), 0)
+
+    def test_continuous_traffic(self):
+        # Saniyede 200 farklı istek, 10 dakika: bekleyenler hız x zaman aşımı civarında kalmalı
+        wheel = RequestTimingWheel(timeout=5.0, tick=0.25)
+        rate = 200
+        for i in range(rate * 600):
+            wheel.add(f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}", "10.0.0.5", i / rate)
+            if i % rate == 0:
+                self.assertLessEqual(len(wheel), rate * (5.0 + 0.25) + 1)
+        self.assertGreaterEqual(len(wheel), rate * 5.0)
+        self.assertEqual(wheel.dropped, 0)
+
+class ARPPacketDetectorTest(unittest.TestCase):
+    def test_bindings_are_bounded(self):
+        detector = ARPPacketDetector(track_requests=False, max_bindings=100)
+        gateway_reply = parse_arp_frame(FRAMES[1], 0.0)
+        detector.process(gateway_reply)
+        # Rastgele gönderen IP'leriyle sel
+        for i in range(1000):
+            frame = _arp_frame(2, HOST_MAC, f"10.1.{i >> 8}.{i & 255}", GATEWAY_MAC, "10.0.0.1")
+            detector.process(parse_arp_frame(frame, i / 1000))
+            if i % 50 == 0:
+                # Gerçek gateway yanıt vermeye devam ettikçe eşlemesi atılmaz
+                detector.process(parse_arp_frame(FRAMES[1], i / 1000))
+        self.assertEqual(len(detector.bindings), 100)
+        self.assertEqual(detector.bindings["10.0.0.1"], "00:16:3e:00:00:01")
+
+    def test_reply_to_request_is_solicited(self):
+        detector = ARPPacketDetector()
+        self.assertEqual(detector.process(parse_arp_frame(FRAMES[0], 100.0)), [])
+        self.assertEqual(detector.process(parse_arp_frame(FRAMES[1], 100.1)), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tablo Tabanlı Tespit Testleri
+Taramalar arası eşleme takibi ve ARP tablosu tespit yolları için testler.
+"""
+
+import random
+import unittest
+from unittest import mock
+
+from modules import arp_detector
+from modules.arp_detector import (
+    NUMPY_AVAILABLE, ARPTable, BindingTracker, detect_arp_spoofing,
+)
+
+def _entry(ip, mac, interface="eth0"):
+    """Tek bir ARP tablosu kaydı"""
+    return {"ip": ip, "mac": mac, "interface": interface}
+
+class BindingTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.tracker = BindingTracker()
+        self.initial = self.tracker.update([_entry("10.0.0.1", "00:16:3E:00:00:01"),
+                                            _entry("10.0.0.5", "00:16:3e:00:00:05")])
+
+    def test_first_table_has_no_findings(self):
+        self.assertEqual(len(self.initial["added"]), 2)
+        self.assertEqual(self.initial["findings"], [])
+
+    def test_unchanged_table(self):
+        diff = self.tracker.update([_entry("10.0.0.5", "00:16:3e:00:00:05"),
+                                    _entry("10.0.0.1", "00:16:3e:00:00:01")])
+        self.assertEqual((diff["added"], diff["removed"], diff["changed"], diff["findings"]),
+                         ([], [], [], []))
+
+    def test_changed_binding(self):
+        diff = self.tracker.update([_entry("10.0.0.1", "00:16:3e:00:00:ee"),
+                                    _entry("10.0.0.5", "00:16:3e:00:00:05")])
+        self.assertEqual(diff["changed"], [(("10.0.0.1", "eth0"), "00:16:3e:00:00:01", "00:16:3e:00:00:ee")])
+        self.assertEqual(len(diff["findings"]), 1)
+        finding = diff["findings"][0]
+        self.assertEqual((finding["type"], finding["threat_level"]), ("binding_changed", "high"))
+        self.assertEqual((finding["ip"], finding["old_mac"], finding["mac"]),
+                         ("10.0.0.1", "00:16:3e:00:00:01", "00:16:3e:00:00:ee"))
+
+    def test_removed_and_added(self):
+        diff = self.tracker.update([_entry("10.0.0.1", "00:16:3e:00:00:01"),
+                                    _entry("10.0.0.9", "00:16:3e:00:00:09")])
+        self.assertEqual(diff["removed"], [("10.0.0.5", "eth0")])
+        self.assertEqual(diff["added"], [("10.0.0.9", "eth0")])
+        self.assertEqual(diff["findings"], [])
+
+    def test_same_ip_on_other_interface_is_not_a_change(self):
+        diff = self.tracker.update([_entry("10.0.0.1", "00:16:3e:00:00:01"),
+                                    _entry("10.0.0.5", "00:16:3e:00:00:05"),
+                                    _entry("10.0.0.1", "00:16:3e:00:00:ee", "wlan0")])
+        self.assertEqual(diff["changed"], [])
+        self.assertEqual(diff["findings"], [])
+
+    def test_neighbour_event(self):
+        findings = self.tracker.apply_event("10.0.0.5", "eth0", "00:16:3e:00:00:ee")
+        self.assertEqual([finding["type"] for finding in findings], ["binding_changed"])
+        self.assertEqual(self.tracker.apply_event("10.0.0.5", "eth0", "00:16:3e:00:00:ee"), [])
+        self.assertEqual(self.tracker.apply_event("10.0.0.5", "eth0", None, deleted=True), [])
+
+def _mixed_table(rows=3000):
+    """Tüm tespit durumlarını içeren deterministik bir tablo oluşturur"""
+    rng = random.Random(13)
+    entries = []
+    for i in range(rows):
+        ip = f"10.{i >> 16}.{(i >> 8) & 255}.{(i & 255) or 1}"
+        kind = rng.random()
+        if kind < 0.05:
+            mac = "ff:ff:ff:ff:ff:ff"
+        elif kind < 0.10:
+            mac = f"01:00:5e:00:00:{i & 255:02x}"
+        elif kind < 0.25:
+            # Birden fazla IP'ye dağılan MAC'ler
+            mac = f"00:16:3e:aa:00:{rng.randrange(40):02x}"
+        else:
+            mac = f"{rng.choice((0x00, 0x02, 0x0a)):02x}:16:3e:{i >> 16:02x}:{(i >> 8) & 255:02x}:{i & 255:02x}"
+        entries.append({"ip": ip, "mac": mac, "interface": "eth0"})
+    # Ağ geçidi için ikinci bir MAC
+    entries.append({"ip": "10.0.0.1", "mac": "00:16:3e:bb:bb:bb", "interface": "eth0"})
+    return entries
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy kurulu değil")
+class VectorizedDetectionTest(unittest.TestCase):
+    def test_same_findings_as_pure_python(self):
+        table = ARPTable.from_entries(_mixed_table())
+        gateway = {"ip": "10.0.0.1", "mac": "00:16:3e:00:00:01", "interface": "eth0"}
+        with mock.patch.object(arp_detector, "VECTORIZED_DETECTION_THRESHOLD", len(table) + 1):
+            python_findings = detect_arp_spoofing(table, gateway)
+        with mock.patch.object(arp_detector, "VECTORIZED_DETECTION_THRESHOLD", 0):
+            numpy_findings = detect_arp_spoofing(table, gateway)
+        types = {finding["type"] for finding in python_findings}
+        self.assertTrue({"multiple_ips", "gateway_multiple_macs", "info_broadcast", "info_multicast"} <= types)
+        self.assertEqual(numpy_findings, python_findings)
+
+if __name__ == "__main__":
+    unittest.main()
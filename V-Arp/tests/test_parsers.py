@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Ayrıştırıcı Testleri
+/proc dosyaları ve netlink komşu dökümü ayrıştırıcıları için testler. Testler
+ağ ya da root yetkisi gerektirmez. Çalıştırma (V-Arp dizininde):
+
+    python -m pytest tests
+"""
+
+import socket
+import struct
+import unittest
+
+from modules.arp_detector import (
+    NLMSG_DONE, NLMSG_ERROR, RTM_DELNEIGH, RTM_NEWNEIGH, NDA_DST, NDA_LLADDR, parse_neigh_dump,
+    parse_proc_net_arp, parse_proc_net_route,
+)
+
+# Netlink mesajı oluşturma yardımcıları
+def _rtattr(rta_type, data):
+    """Hizalanmış bir rtattr özniteliği oluşturur"""
+    attr = struct.pack("=HH", 4 + len(data), rta_type) + data
+    return attr + b"\x00" * (-len(attr) % 4)
+
+def _neigh_message(msg_type, ip, mac, ifindex=2, state=0x02, family=socket.AF_INET):
+    """Tek bir RTM_NEWNEIGH/RTM_DELNEIGH mesajı oluşturur"""
+    body = struct.pack("=BxxxiHBB", family, ifindex, state, 0, 0)
+    body += _rtattr(NDA_DST, socket.inet_aton(ip))
+    if mac is not None:
+        body += _rtattr(NDA_LLADDR, bytes.fromhex(mac.replace(":", "")))
+    return struct.pack("=IHHII", 16 + len(body), msg_type, 0, 1, 0) + body
+
+def _done_message():
+    """Dökümün sonunu bildiren NLMSG_DONE mesajı"""
+    return struct.pack("=IHHIIi", 20, NLMSG_DONE, 0, 1, 0, 0)
+
+class ParseProcNetArpTest(unittest.TestCase):
+    CONTENT = (
+        "IP address       HW type     Flags       HW address            Mask     Device\n"
+        "192.168.1.1      0x1         0x2         aa:bb:cc:dd:ee:01     *        eth0\n"
+        "192.168.1.20     0x1         0x0         00:00:00:00:00:00     *        eth0\n"
+        "192.168.1.30     0x1         0x6         aa:bb:cc:dd:ee:1e     *        wlan0\n"
+        "bozuk satır\n"
+    )
+
+    def test_complete_entries(self):
+        self.assertEqual(parse_proc_net_arp(self.CONTENT), [
+            {"ip": "192.168.1.1", "mac": "aa:bb:cc:dd:ee:01", "interface": "eth0"},
+            {"ip": "192.168.1.30", "mac": "aa:bb:cc:dd:ee:1e", "interface": "wlan0"},
+        ])
+
+    def test_header_only(self):
+        self.assertEqual(parse_proc_net_arp(self.CONTENT.splitlines()[0]), [])
+
+class ParseNeighDumpTest(unittest.TestCase):
+    def test_dump(self):
+        buffer = (_neigh_message(RTM_NEWNEIGH, "10.0.0.1", "00:16:3e:00:00:01") +
+                  _neigh_message(RTM_NEWNEIGH, "10.0.0.9", None, state=0x01) +
+                  _neigh_message(RTM_DELNEIGH, "10.0.0.7", "00:16:3e:00:00:07", state=0x20) +
+                  _done_message())
+        entries, done = parse_neigh_dump(buffer, {2: "eth0"})
+        self.assertTrue(done)
+        self.assertEqual(entries, [
+            {"ip": "10.0.0.1", "mac": "00:16:3e:00:00:01", "interface": "eth0",
+             "state": "REACHABLE", "deleted": False},
+            {"ip": "10.0.0.9", "mac": None, "interface": "eth0",
+             "state": "INCOMPLETE", "deleted": False},
+            {"ip": "10.0.0.7", "mac": "00:16:3e:00:00:07", "interface": "eth0",
+             "state": "FAILED", "deleted": True},
+        ])
+
+    def test_partial_buffer(self):
+        entries, done = parse_neigh_dump(_neigh_message(RTM_NEWNEIGH, "10.0.0.1", "00:16:3e:00:00:01"),
+                                         {2: "eth0"})
+        self.assertFalse(done)
+        self.assertEqual(len(entries), 1)
+
+    def test_skips_non_ipv4(self):
+        message = _neigh_message(RTM_NEWNEIGH, "10.0.0.1", "00:16:3e:00:00:01", family=socket.AF_INET6)
+        self.assertEqual(parse_neigh_dump(message + _done_message(), {2: "eth0"}), ([], True))
+
+    def test_error_message(self):
+        error = struct.pack("=IHHIIi", 36, NLMSG_ERROR, 0, 1, 0, -1) + b"\x00" * 16
+        with self.assertRaises(OSError):
+            parse_neigh_dump(error)
+
+class ParseProcNetRouteTest(unittest.TestCase):
+    HEADER = "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+
+    def test_lowest_metric_default_route(self):
+        content = (self.HEADER +
+                   "eth0\t00000000\t0101A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+                   "wlan0\t00000000\t0100000A\t0003\t0\t0\t50\t00000000\t0\t0\t0\n"
+                   "eth0\t0001A8C0\t00000000\t0001\t0\t0\t0\t00FFFFFF\t0\t0\t0\n")
+        self.assertEqual(parse_proc_net_route(content), ("10.0.0.1", "wlan0"))
+
+    def test_ignores_down_and_gatewayless_routes(self):
+        content = (self.HEADER +
+                   "eth0\t00000000\t0101A8C0\t0002\t0\t0\t0\t00000000\t0\t0\t0\n"
+                   "eth1\t00000000\t00000000\t0001\t0\t0\t0\t00000000\t0\t0\t0\n")
+        self.assertIsNone(parse_proc_net_route(content))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tarayıcı Testleri
+ARPScanner'ın tarama isteklerini birleştirmesi ve izleme modunun bildirim
+taşmasından kurtulması için testler. Gerçek tarama ve netlink soketi yerine
+sahteleri kullanılır.
+"""
+
+import asyncio
+import errno
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from modules import arp_detector
+from modules import async_scanner
+from modules.arp_detector import ARPScanner, GatewayBaseline
+from modules.async_scanner import AsyncARPScanner
+
+class ScanCoalescingTest(unittest.TestCase):
+    def setUp(self):
+        self.scanner = ARPScanner()
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.sweeps = []
+
+        def fake_scan(sweep=False):
+            self.sweeps.append(sweep)
+            self.started.set()
+            self.release.wait(5)
+            return {"sweep": sweep}
+
+        self.scanner._scan_thread = fake_scan
+
+    def tearDown(self):
+        self.release.set()
+        self.scanner.stop()
+
+    def _wait_idle(self):
+        deadline = time.time() + 5
+        while self.scanner.running and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(self.scanner.running)
+
+    def test_requests_during_scan_share_one_followup(self):
+        first = self.scanner.start_scan()
+        self.assertTrue(self.started.wait(5))
+        second = self.scanner.start_scan()
+        third = self.scanner.start_scan(sweep=True)
+        self.assertIsNot(first, second)
+        self.assertIs(second, third)
+
+        self.release.set()
+        self.assertEqual(first.result(5), {"sweep": False})
+        # Birleşen isteklerden biri aktif tarama istediği için takip taraması da yapar
+        self.assertEqual(third.result(5), {"sweep": True})
+        self._wait_idle()
+        self.assertEqual(self.sweeps, [False, True])
+
+    def test_cancelled_followup_is_not_run(self):
+        first = self.scanner.start_scan()
+        self.assertTrue(self.started.wait(5))
+        second = self.scanner.start_scan()
+        self.assertTrue(second.cancel())
+
+        self.release.set()
+        first.result(5)
+        self._wait_idle()
+        self.assertEqual(self.sweeps, [False])
+
+    def test_new_scan_after_idle(self):
+        self.release.set()
+        first = self.scanner.start_scan()
+        first.result(5)
+        self._wait_idle()
+        second = self.scanner.start_scan()
+        self.assertIsNot(first, second)
+        self.assertEqual(second.result(5), {"sweep": False})
+
+class _OverflowingSocket:
+    """İlk okumada ENOBUFS veren, sonra boş veri döndüren netlink soketi taklidi"""
+    def __init__(self):
+        self.reader, self.writer = socket.socketpair()
+        self.writer.send(b"x")
+        self.overflowed = False
+
+    def fileno(self):
+        return self.reader.fileno()
+
+    def recv(self, size):
+        if not self.overflowed:
+            self.overflowed = True
+            raise OSError(errno.ENOBUFS, os.strerror(errno.ENOBUFS))
+        return self.reader.recv(size)[:0]
+
+    def close(self):
+        self.reader.close()
+        self.writer.close()
+
+class MonitorOverflowTest(unittest.TestCase):
+    def setUp(self):
+        self.scanner = ARPScanner()
+        self.directory = tempfile.TemporaryDirectory()
+        self.scanner.gateway_baseline = GatewayBaseline(os.path.join(self.directory.name, "baseline.json"))
+        self.results = []
+        self.scanner.callback = self.results.append
+
+    def tearDown(self):
+        self.scanner.monitor_stop_event.set()
+        self.directory.cleanup()
+
+    def test_overflow_resyncs_and_keeps_listening(self):
+        tables = [
+            [{"ip": "10.0.0.1", "mac": "00:16:3e:00:00:01", "interface": "eth0"}],
+            [{"ip": "10.0.0.1", "mac": "00:16:3e:00:00:ee", "interface": "eth0"}],
+        ]
+        sock = _OverflowingSocket()
+        self.scanner.monitor_running = True
+        with mock.patch.object(arp_detector, "get_arp_table", side_effect=tables):
+            thread = threading.Thread(target=self.scanner._monitor_thread, args=(sock,))
+            thread.start()
+            deadline = time.time() + 5
+            while not self.results and time.time() < deadline:
+                time.sleep(0.01)
+            # Taşmadan sonra izleme sürmeli
+            self.assertTrue(thread.is_alive())
+            self.assertTrue(self.scanner.monitor_running)
+            self.scanner.monitor_stop_event.set()
+            thread.join(5)
+
+        self.assertEqual(len(self.results), 1)
+        types = [finding["type"] for finding in self.results[0]["suspicious_entries"]]
+        self.assertIn("binding_changed", types)
+
+class AsyncSnifferTest(unittest.TestCase):
+    def test_error_callback_is_kept(self):
+        def on_error(error):
+            pass
+        self.assertIs(AsyncARPScanner(error_callback=on_error).error_callback, on_error)
+
+    def test_frame_flood_does_not_starve_the_loop(self):
+        reader, writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        writer.setblocking(False)
+        sent = 0
+        try:
+            while sent < 2000:
+                writer.send(b"\x00" * 60)
+                sent += 1
+        except BlockingIOError:
+            pass
+        self.assertGreater(sent, async_scanner.SNIFFER_FRAMES_PER_WAKEUP)
+
+        ticks = [0]
+        parsed = []  # Her çerçeve işlenirken döngünün kaç tur attığı
+
+        def fake_parse(frame, timestamp=None):
+            parsed.append(ticks[0])
+            return None
+
+        async def ticker():
+            while True:
+                ticks[0] += 1
+                await asyncio.sleep(0)
+
+        async def run():
+            scanner = AsyncARPScanner()
+            watcher = scanner.watch("sniffer")
+            watch_task = asyncio.ensure_future(watcher.__anext__())
+            tick_task = asyncio.ensure_future(ticker())
+            deadline = time.time() + 5
+            while len(parsed) < sent and time.time() < deadline:
+                await asyncio.sleep(0.01)
+            watch_task.cancel()
+            tick_task.cancel()
+            await asyncio.gather(watch_task, tick_task, return_exceptions=True)
+            await watcher.aclose()
+
+        with mock.patch.object(async_scanner, "open_arp_sniffer_socket", return_value=reader), \
+             mock.patch.object(async_scanner, "parse_arp_frame", side_effect=fake_parse):
+            asyncio.run(run())
+        writer.close()
+
+        self.assertEqual(len(parsed), sent)
+        # Çerçeveler tek bir geri çağrıda değil, döngü turları arasında işlenmeli
+        self.assertGreater(len(set(parsed)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -56,6 +56,10 @@ class BaseScreen:
     def on_scan_completed(self, result):
         """Tarama tamamlandığında çağrılır"""
         pass
+    
+    def on_scan_failed(self, error):
+        """Tarama başarısız olduğunda çağrılır"""
+        pass
 
 class DashboardScreen(BaseScreen):
     """Ana gösterge paneli ekranı"""
@@ -279,6 +283,10 @@ def _create_widgets(self):
         if self.app.start_scan():
             self.scan_button.configure(text="Taranıyor...", state="disabled")
     
+    def on_scan_failed(self, error):
+        """Tarama başarısız olduğunda tarama butonunu normal duruma getirir"""
+        self.scan_button.configure(text="Ağı Tara", state="normal")
+    
     def _create_scan_summary(self, result):
         """Tarama sonuç özetini oluşturur"""
         # Eski özet widget'ları temizle
@@ -611,6 +619,8 @@ class ScanScreen(BaseScreen):
             
             # MAC adresi
             mac = format_mac_for_display(device.get("mac", "Bilinmiyor"))
+            if device.get("vendor"):
+                mac = f"{mac} ({device['vendor']})"
             mac_label = tk.Label(row_frame, text=mac, font=("Arial", 11), 
                               bg=row_frame["bg"], fg=THEME["text_primary"],
                               anchor="w", width=columns[1]//10)
@@ -685,7 +695,18 @@ class ScanScreen(BaseScreen):
         if hasattr(self.app, 'scanner') and hasattr(self.app.scanner, 'periodic_running'):
             if self.app.scanner.periodic_running:
                 interval = self.app.scanner.scan_interval
-                self.periodic_status.config(text=f"Periyodik tarama: Aktif (Her {interval} saatte bir)")
+                # Uyarlanabilir aralık sıklaştıysa etkin aralığı göster
+                effective = result.get("effective_interval")
+                if effective is not None and effective < interval * 3600:
+                    if effective < 60:
+                        effective_text = f"{effective:g} saniye"
+                    elif effective < 3600:
+                        effective_text = f"{effective / 60:.0f} dakika"
+                    else:
+                        effective_text = f"{effective / 3600:.1f} saat"
+                    self.periodic_status.config(text=f"Periyodik tarama: Aktif (Her {interval} saatte bir, şu an her {effective_text})")
+                else:
+                    self.periodic_status.config(text=f"Periyodik tarama: Aktif (Her {interval} saatte bir)")
                 self.periodic_button.configure(text="Taramayı Durdur", bg=THEME["warning"])
             else:
                 self.periodic_status.config(text="Periyodik tarama: Kapalı")
@@ -697,6 +718,10 @@ class ScanScreen(BaseScreen):
             # Tarama durumunu güncelle
             self._update_status(result)
             
+            # Tablo değişmediyse cihaz listesini yeniden çizme
+            if result.get("unchanged") and self.devices:
+                return
+            
             # Cihaz listesini oluştur
             devices = result.get("arp_table", [])
             self.devices = devices
@@ -715,6 +740,11 @@ class ScanScreen(BaseScreen):
                 self.on_scan_completed(last_result)
             else:
                 self._update_status(None)
+    
+    def on_scan_failed(self, error):
+        """Tarama başarısız olduğunda tarama durumunu sıfırlar"""
+        self._update_status(None)
+        self.status_label.config(text="Tarama başarısız", fg=THEME["error"])
 
 class ThreatAnalysisScreen(BaseScreen):
     """Tehdit analizi ekranı"""
@@ -843,6 +873,11 @@ class ThreatAnalysisScreen(BaseScreen):
             self.scan_button.configure(text="Taranıyor...", state="disabled")
             self.status_label.config(text="Ağ taranıyor...", fg=THEME["info"])
     
+    def on_scan_failed(self, error):
+        """Tarama başarısız olduğunda butonu ve durumu sıfırlar"""
+        self.scan_button.configure(text="Ağı Tara", state="normal")
+        self.status_label.config(text="Tarama başarısız", fg=THEME["error"])
+    
     def _filter_threats(self, filter_type):
         """Tehditleri filtrelemek için kullanılır"""
         # Aktif filtreyi güncelle
@@ -928,6 +963,19 @@ class ThreatAnalysisScreen(BaseScreen):
                               font=("Arial", 11), bg=bg_color, fg=THEME["text_primary"])
             mac_value.pack(side=tk.LEFT)
         
+        # MAC üreticisi
+        if "vendor" in threat:
+            vendor_frame = tk.Frame(details_frame, bg=bg_color)
+            vendor_frame.pack(fill=tk.X, pady=2)
+            
+            vendor_title = tk.Label(vendor_frame, text="Üretici:", font=("Arial", 11, "bold"), 
+                                 bg=bg_color, fg=THEME["text_secondary"], width=10, anchor="w")
+            vendor_title.pack(side=tk.LEFT)
+            
+            vendor_value = tk.Label(vendor_frame, text=threat["vendor"], 
+                                 font=("Arial", 11), bg=bg_color, fg=THEME["text_primary"])
+            vendor_value.pack(side=tk.LEFT)
+        
         # IP adresi
         if "ip" in threat:
             ip_frame = tk.Frame(details_frame, bg=bg_color)
@@ -989,8 +1037,30 @@ class ThreatAnalysisScreen(BaseScreen):
                                 wraplength=600, justify=tk.LEFT)
             recom_value.pack(anchor="w", pady=5)
         
+        # Router değiştiyse yeni gateway MAC'ini onaylama
+        if threat.get("type") == "gateway_baseline_changed":
+            accept_button = SpotifyButton(card, text="Yeni MAC'i Onayla", 
+                                      command=lambda: self._accept_gateway_mac(threat),
+                                      width=160, height=32, bg=THEME["secondary"])
+            accept_button.pack(anchor="w", pady=(5, 0))
+        
         return card
     
+    def _accept_gateway_mac(self, threat):
+        """Gateway'in yeni MAC adresini kullanıcı onayıyla taban çizgisi yapar"""
+        message = (f"Ağ geçidi {threat['ip']} için yeni MAC adresi {format_mac_for_display(threat['mac'])} "
+                   f"olarak kaydedilecek.\n\nBunu sadece router'ınızı değiştirdiyseniz onaylayın. "
+                   f"Devam edilsin mi?")
+        if not messagebox.askyesno("Yeni Gateway MAC'i", message):
+            return
+        try:
+            self.app.scanner.accept_gateway_mac(threat["ip"], threat.get("interface"), threat["mac"])
+            # Uyarının kalktığını görmek için yeniden tara
+            self.app.start_scan()
+        except Exception as e:
+            logger.error(f"Gateway MAC'i onaylanırken hata: {e}")
+            messagebox.showerror("Hata", f"Gateway MAC'i kaydedilemedi: {e}")
+    
     def _populate_threats_list(self):
         """Tehdit listesini doldurur"""
         # Mevcut içeriği temizle
@@ -1076,6 +1146,10 @@ class ThreatAnalysisScreen(BaseScreen):
             # UI güncellemelerini yap
             self.scan_button.configure(text="Ağı Tara", state="normal")
             
+            # Bulgular değişmediyse özet ve listeyi yeniden çizme
+            if result.get("unchanged"):
+                return
+            
             # Tehdit özetini güncelle
             self._update_threat_summary(result)
             
@@ -1617,7 +1691,8 @@ class VARPApp:
             # ARP tarayıcısını başlat
             try:
                 logger.debug("ARPScanner oluşturuluyor...")
-                self.scanner = ARPScanner(callback=self.on_scan_completed)
+                self.scanner = ARPScanner(callback=self.on_scan_completed,
+                                          error_callback=self.on_scan_failed)
                 logger.debug("ARPScanner başarıyla oluşturuldu.")
             except Exception as e:
                 logger.error(f"ARPScanner oluşturulurken hata: {e}")
@@ -1882,12 +1957,10 @@ class VARPApp:
                 self.background_canvas.resize(width, height)
     
     def start_scan(self):
-        """Tarama başlatır"""
-        if not self.scanner.running:
-            self.scanner.start_scan()
-            self.status_label.config(text="Taranıyor...")
-            return True
-        return False
+        """Tarama başlatır (tarama sürüyorsa istek takip taramasına eklenir)"""
+        future = self.scanner.start_scan()
+        self.status_label.config(text="Taranıyor...")
+        return future
     
     def start_periodic_scan(self, interval_hours=None):
         """Periyodik taramayı başlatır"""
@@ -1927,10 +2000,27 @@ class VARPApp:
         if result.get("threat_level") == "high":
             self._show_threat_warning(result)
     
+    def on_scan_failed(self, error):
+        """Tarama başarısız olduğunda çağrılır (tarama thread'inden)"""
+        logger.error(f"Tarama başarısız: {error}")
+        # Arayüz güncellemelerini Tk ana döngüsünde yap
+        self.root.after(0, self._handle_scan_failure, error)
+    
+    def _handle_scan_failure(self, error):
+        """Takılı kalan tarama durumlarını sıfırlar"""
+        self.status_label.config(text="Tarama başarısız")
+        for screen in self.screens.values():
+            try:
+                screen.on_scan_failed(error)
+            except Exception as e:
+                logger.error(f"Ekran tarama hatasını işlerken hata: {e}")
+    
     def _show_threat_warning(self, result):
-        """Tehdit uyarısı gösterir"""
-        high_threats = [entry for entry in result.get("suspicious_entries", []) 
-                      if entry.get("threat_level") == "high"]
+        """Yeni açılan ya da yüksek seviyeye çıkan olaylar için tehdit uyarısı gösterir"""
+        # Süren olaylar her taramada tekrar uyarı göstermez
+        high_threats = [transition["incident"]["finding"] for transition in result.get("incidents", [])
+                        if (transition["transition"] == "open" or transition.get("escalated"))
+                        and transition["incident"]["threat_level"] == "high"]
         
         if not high_threats:
             return